@@ -4,8 +4,36 @@
 import pandas as pd
 import numpy as np
 
-# Load the tournament results
-df = pd.read_csv('version1/experiments/logs/evaluation/tournament_results.csv')
+from core.utils.helpers import read_csv_cached
+
+# Columns used by the analysis below, with compact dtypes (categorical keys,
+# 32-bit numerics) to cut parsing and groupby cost
+COLS = [
+    'episode', 'step', 'agent', 'price', 'innovation_stock', 'market_share',
+    'marginal_cost', 'profit_step', 'cum_profit', 'economic_regime',
+]
+DTYPES = {
+    'episode': 'int32',
+    'step': 'int32',
+    'agent': 'category',
+    'economic_regime': 'category',
+    'price': 'float32',
+    'innovation_stock': 'float32',
+    'market_share': 'float32',
+    'marginal_cost': 'float32',
+    'profit_step': 'float32',
+    'cum_profit': 'float32',
+}
+
+# Load the tournament results (via a Parquet cache after the first run)
+df = read_csv_cached(
+    'version1/experiments/logs/evaluation/tournament_results.csv',
+    columns=COLS,
+    dtype=DTYPES,
+)
+
+# Sort once so every groupby below hits the sorted-key fast path
+df.sort_values(['agent', 'episode', 'step'], inplace=True, kind='mergesort')
 
 print('=== TOURNAMENT RESULTS ANALYSIS ===\n')
 print(f'Total rows: {len(df)}')
@@ -14,81 +42,85 @@ print(f'Steps per episode: {df["step"].max() + 1}')
 print(f'\nColumns: {list(df.columns)}')
 
 print('\n=== PRICE ANALYSIS ===')
-for agent in ['firm_0', 'firm_1', 'firm_2']:
-    agent_data = df[df['agent'] == agent]
-    print(f'{agent}:')
-    print(f'  Min price: ${agent_data["price"].min():.2f}')
-    print(f'  Max price: ${agent_data["price"].max():.2f}')
-    print(f'  Avg price: ${agent_data["price"].mean():.2f}')
-    print(f'  Std dev: ${agent_data["price"].std():.2f}')
+agent_groups = df.groupby('agent', sort=False, observed=True)
+price_stats = agent_groups['price'].agg(['min', 'max', 'mean', 'std'])
+price_table = price_stats.set_axis(['Min price', 'Max price', 'Avg price', 'Std dev'], axis=1)
+with pd.option_context('display.float_format', '${:,.2f}'.format):
+    print(price_table.to_string())
+
+# Per-episode stats for every agent in one pass; unstacked so each agent
+# is a column (episode x agent) instead of a MultiIndex level to mask on
+episode_stats = df.groupby(['episode', 'agent'], sort=False, observed=True).agg(
+    cum_profit=('cum_profit', 'max'),
+    market_share=('market_share', 'mean'),
+    innovation_stock=('innovation_stock', 'max'),
+).unstack('agent')
 
 print('\n=== PROFIT ANALYSIS (per episode) ===')
-episode_profits = df.groupby(['episode', 'agent'])['cum_profit'].max()
-for agent in ['firm_0', 'firm_1', 'firm_2']:
-    agent_profits = episode_profits[episode_profits.index.get_level_values('agent') == agent].values
+for agent, agent_profits in episode_stats['cum_profit'].items():
     print(f'{agent}:')
     print(f'  Min: ${agent_profits.min():.0f}')
     print(f'  Max: ${agent_profits.max():.0f}')
     print(f'  Mean: ${agent_profits.mean():.0f}')
-    profitable = (agent_profits > 0).sum() / len(agent_profits) * 100
+    profitable = (agent_profits > 0).mean() * 100
     print(f'  % Profitable: {profitable:.1f}%')
 
 print('\n=== MARKET SHARES (avg per episode) ===')
-episode_shares = df.groupby(['episode', 'agent'])['market_share'].mean()
-for agent in ['firm_0', 'firm_1', 'firm_2']:
-    agent_shares = episode_shares[episode_shares.index.get_level_values('agent') == agent].values
-    print(f'{agent}: {agent_shares.mean():.1%} (std: {agent_shares.std():.1%})')
+for agent, agent_shares in episode_stats['market_share'].items():
+    print(f'{agent}: {agent_shares.mean():.1%} (std: {agent_shares.std(ddof=0):.1%})')
 
 print('\n=== INNOVATION (final stock per episode) ===')
-episode_innovation = df.groupby(['episode', 'agent'])['innovation_stock'].max()
-for agent in ['firm_0', 'firm_1', 'firm_2']:
-    agent_innovation = episode_innovation[episode_innovation.index.get_level_values('agent') == agent].values
-    print(f'{agent}: {agent_innovation.mean():.2f} (std: {agent_innovation.std():.2f})')
+for agent, agent_innovation in episode_stats['innovation_stock'].items():
+    print(f'{agent}: {agent_innovation.mean():.2f} (std: {agent_innovation.std(ddof=0):.2f})')
 
 print('\n=== EFFICIENCY BY REGIME ===')
-for regime in df['economic_regime'].unique():
-    regime_data = df[df['economic_regime'] == regime]
+regime_stats = df.groupby(['economic_regime', 'agent'], sort=False, observed=True)[['price', 'market_share']].mean()
+for regime, regime_data in regime_stats.groupby(level='economic_regime', sort=False, observed=True):
     print(f'\n{regime.upper()} regime:')
-    for agent in ['firm_0', 'firm_1', 'firm_2']:
-        agent_data = regime_data[regime_data['agent'] == agent]
-        print(f'  {agent}: Price=${agent_data["price"].mean():.2f}, Share={agent_data["market_share"].mean():.1%}')
+    for (_, agent), stats in regime_data.iterrows():
+        print(f'  {agent}: Price=${stats["price"]:.2f}, Share={stats["market_share"]:.1%}')
 
 print('\n=== CORRELATION: PRICE vs PROFIT ===')
-for agent in ['firm_0', 'firm_1', 'firm_2']:
-    agent_data = df[df['agent'] == agent]
-    corr = agent_data['price'].corr(agent_data['profit_step'])
+price_profit_corr = agent_groups[['price', 'profit_step']].corr().xs('price', level=1)['profit_step']
+for agent, corr in price_profit_corr.items():
     print(f'{agent}: {corr:.3f} (higher price -> {"higher" if corr > 0 else "lower"} profit)')
 
 print('\n=== CORRELATION: INNOVATION vs MARKET SHARE ===')
-for agent in ['firm_0', 'firm_1', 'firm_2']:
-    agent_data = df[df['agent'] == agent]
-    corr = agent_data['innovation_stock'].corr(agent_data['market_share'])
+innovation_share_corr = (
+    agent_groups[['innovation_stock', 'market_share']].corr()
+    .xs('innovation_stock', level=1)['market_share']
+)
+for agent, corr in innovation_share_corr.items():
     print(f'{agent}: {corr:.3f} (more innovation -> {"higher" if corr > 0 else "lower"} share)')
 
 print('\n=== PRICE WAR ANALYSIS ===')
-price_dispersion = df.groupby('episode')['price'].std()
+price_dispersion = df.groupby('episode', sort=False)['price'].std()
 price_war_threshold = 5.0  # $5+ std dev indicates active competition
 price_war_episodes = price_dispersion[price_dispersion > price_war_threshold].index.tolist()
 print(f'Price war episodes: {price_war_episodes} ({len(price_war_episodes)}/10)')
 
 if len(price_war_episodes) > 0:
     pw_data = df[df['episode'].isin(price_war_episodes)]
+    pw_episodes = pw_data.groupby('episode', sort=False)
+    pw_prices = pw_episodes['price']
+    price_ranges = pw_prices.max() - pw_prices.min()
     print(f'\nDuring price wars:')
-    print(f'  Avg price range: ${pw_data.groupby("episode")["price"].apply(lambda x: x.max() - x.min()).mean():.2f}')
-    print(f'  Avg profit impact: ${pw_data.groupby("episode")["cum_profit"].last().mean():.0f}')
-    pw_winners = pw_data.groupby(['episode', 'agent'])['market_share'].mean().groupby('episode').idxmax()
+    print(f'  Avg price range: ${price_ranges.mean():.2f}')
+    print(f'  Avg profit impact: ${pw_episodes["cum_profit"].last().mean():.0f}')
+    # Episode x agent share matrix; the winner is the row-wise argmax
+    pw_shares = pw_data.groupby(['episode', 'agent'], sort=False, observed=True)['market_share'].mean().unstack()
+    pw_winners = pw_shares.columns[pw_shares.to_numpy().argmax(axis=1)]
     print(f'  Price war winners: {pw_winners.value_counts().to_dict()}')
 else:
     print('No price wars detected (price coordination observed)')
 
 print('\n=== PRICING STRATEGIES ===')
-for agent in ['firm_0', 'firm_1', 'firm_2']:
-    agent_data = df[df['agent'] == agent]
-    avg_price = agent_data['price'].mean()
-    avg_cost = agent_data['marginal_cost'].mean()
-    markup = ((avg_price - avg_cost) / avg_cost) * 100
-    print(f'{agent}:')
-    print(f'  Avg markup: {markup:.1f}% above cost')
-    print(f'  Price volatility: ${agent_data["price"].std():.2f}')
-    print(f'  Min price: ${agent_data["price"].min():.2f}')
-    print(f'  Max price: ${agent_data["price"].max():.2f}')
+avg_costs = agent_groups['marginal_cost'].mean()
+markups = (price_stats['mean'] - avg_costs) / avg_costs * 100
+strategy_table = pd.DataFrame({
+    'Avg markup': markups.map('{:.1f}%'.format),
+    'Price volatility': price_stats['std'].map('${:,.2f}'.format),
+    'Min price': price_stats['min'].map('${:,.2f}'.format),
+    'Max price': price_stats['max'].map('${:,.2f}'.format),
+})
+print(strategy_table.to_string())
@@ -0,0 +1,178 @@
+"""
+Compiled numeric kernels for the core economic models.
+
+Kernels are compiled with Numba when it is installed. Without Numba,
+callers should use the pure-Python scalar kernels for small markets and
+the vectorized NumPy kernels otherwise.
+"""
+
+import math
+
+import numpy as np
+
+# Largest market served by the pure-Python scalar kernels
+SMALL_MARKET_FIRMS = 4
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # Numba is optional
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit``."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def demand_kernel(
+    prices,
+    innovation,
+    base_demand,
+    price_elasticity,
+    innovation_weight,
+    out_demand,
+    out_share,
+):
+    """
+    Softmax demand allocation written into preallocated output arrays.
+
+    Same model as ``demand.compute_demand``; ``out_demand`` and
+    ``out_share`` must be float arrays of length ``len(prices)``.
+    """
+    n_firms = prices.shape[0]
+
+    total_innovation = 0.0
+    max_innovation = innovation[0]
+    for i in range(n_firms):
+        total_innovation += innovation[i]
+        if innovation[i] > max_innovation:
+            max_innovation = innovation[i]
+
+    # Utility, tracking the max for numerical stability
+    max_utility = -np.inf
+    for i in range(n_firms):
+        norm_innovation = 0.0
+        if total_innovation > 0:
+            norm_innovation = innovation[i] / max_innovation
+        utility = -price_elasticity * prices[i] + innovation_weight * norm_innovation
+        out_share[i] = utility
+        if utility > max_utility:
+            max_utility = utility
+
+    # Softmax choice model
+    total_exp = 0.0
+    for i in range(n_firms):
+        out_share[i] = np.exp(out_share[i] - max_utility)
+        total_exp += out_share[i]
+
+    for i in range(n_firms):
+        out_share[i] /= total_exp
+        out_demand[i] = base_demand * out_share[i]
+
+
+def demand_kernel_small(
+    prices,
+    innovation,
+    base_demand,
+    price_elasticity,
+    innovation_weight,
+    out_demand,
+    out_share,
+):
+    """
+    Pure-Python scalar version of ``demand_kernel`` for small markets.
+
+    Works on Python floats, avoiding per-call NumPy dispatch, which
+    dominates the cost when there are only a few firms.
+    """
+    prices = prices.tolist()
+    innovation = innovation.tolist()
+
+    norm = innovation_weight / max(innovation) if sum(innovation) > 0 else 0.0
+    utility = [
+        -price_elasticity * price + norm * innov
+        for price, innov in zip(prices, innovation)
+    ]
+
+    max_utility = max(utility)
+    exp_utility = [math.exp(u - max_utility) for u in utility]
+    total_exp = sum(exp_utility)
+
+    shares = [e / total_exp for e in exp_utility]
+    out_share[:] = shares
+    out_demand[:] = [base_demand * share for share in shares]
+
+
+def demand_kernel_numpy(
+    prices,
+    innovation,
+    base_demand,
+    price_elasticity,
+    innovation_weight,
+    out_demand,
+    out_share,
+):
+    """Vectorized NumPy version of ``demand_kernel`` for larger markets."""
+    if np.sum(innovation) > 0:
+        norm_innovation = innovation / np.max(innovation)
+    else:
+        norm_innovation = np.zeros(len(prices))
+
+    utility = -price_elasticity * prices + innovation_weight * norm_innovation
+
+    np.exp(utility - np.max(utility), out=out_share)
+    out_share /= np.sum(out_share)
+    np.multiply(out_share, base_demand, out=out_demand)
+
+
+@njit(cache=True)
+def hhi_kernel(group_ids, market_shares, n_groups):
+    """Sum of squared market shares per group in one pass over the rows."""
+    hhi = np.zeros(n_groups)
+    for i in range(market_shares.shape[0]):
+        hhi[group_ids[i]] += market_shares[i] * market_shares[i]
+    return hhi
+
+
+def hhi_kernel_numpy(group_ids, market_shares, n_groups):
+    """Vectorized NumPy version of ``hhi_kernel``."""
+    return np.bincount(group_ids, weights=market_shares * market_shares, minlength=n_groups)
+
+
+@njit(cache=True)
+def group_std_kernel(group_ids, values, n_groups):
+    """Sample standard deviation (ddof=1) per group in two passes over the rows."""
+    counts = np.zeros(n_groups)
+    means = np.zeros(n_groups)
+    for i in range(values.shape[0]):
+        counts[group_ids[i]] += 1.0
+        means[group_ids[i]] += values[i]
+    means /= counts
+
+    sq_dev = np.zeros(n_groups)
+    for i in range(values.shape[0]):
+        deviation = values[i] - means[group_ids[i]]
+        sq_dev[group_ids[i]] += deviation * deviation
+
+    std = np.full(n_groups, np.nan)
+    for g in range(n_groups):
+        if counts[g] > 1:
+            std[g] = np.sqrt(sq_dev[g] / (counts[g] - 1.0))
+    return std
+
+
+def group_std_kernel_numpy(group_ids, values, n_groups):
+    """Vectorized NumPy version of ``group_std_kernel``."""
+    counts = np.bincount(group_ids, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.bincount(group_ids, weights=values, minlength=n_groups) / counts
+    deviations = values - means[group_ids]
+    sq_dev = np.bincount(group_ids, weights=deviations * deviations, minlength=n_groups)
+
+    std = np.full(n_groups, np.nan)
+    valid = counts > 1
+    std[valid] = np.sqrt(sq_dev[valid] / (counts[valid] - 1))
+    return std
@@ -0,0 +1,36 @@
+import numpy as np
+
+from core.models._kernels import HAS_NUMBA, hhi_kernel, hhi_kernel_numpy
+
+
+def herfindahl_index(
+    market_shares,
+    group_ids,
+    n_groups
+):
+    """
+    Computes the Herfindahl-Hirschman Index (sum of squared shares) per group.
+
+    Parameters
+    ----------
+    market_shares : np.ndarray
+        Market share of each firm-observation (one row per firm per group).
+    group_ids : np.ndarray
+        Integer group index in ``[0, n_groups)`` for each row, e.g. the
+        factorized (episode, step) of each observation.
+    n_groups : int
+        Number of groups.
+
+    Returns
+    -------
+    hhi : np.ndarray
+        HHI of each group.
+    """
+
+    market_shares = np.asarray(market_shares, dtype=float)
+    group_ids = np.asarray(group_ids, dtype=np.int64)
+
+    # Compiled loop if Numba is available, else a weighted bincount
+    kernel = hhi_kernel if HAS_NUMBA else hhi_kernel_numpy
+
+    return kernel(group_ids, market_shares, int(n_groups))
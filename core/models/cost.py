@@ -7,20 +7,23 @@ def compute_cost(
     """
     Computes total production cost for a firm.
 
+    Purely elementwise, so arrays of any broadcastable shape (e.g. one
+    entry per firm, or (n_markets, n_firms)) are costed in one call.
+
     Parameters
     ----------
-    quantity : float
+    quantity : float or np.ndarray
         Quantity produced / sold by the firm.
-    marginal_cost : float
+    marginal_cost : float or np.ndarray
         Cost per unit of output.
-    innovation_spend : float
+    innovation_spend : float or np.ndarray
         Investment in innovation (R&D).
-    fixed_cost : float
+    fixed_cost : float or np.ndarray
         Fixed operating cost (optional).
 
     Returns
     -------
-    total_cost : float
+    total_cost : float or np.ndarray
         Total cost incurred by the firm.
     """
 
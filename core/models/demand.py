@@ -1,12 +1,21 @@
 import numpy as np
 
+from core.models._kernels import (
+    HAS_NUMBA,
+    SMALL_MARKET_FIRMS,
+    demand_kernel,
+    demand_kernel_numpy,
+    demand_kernel_small,
+)
+
 
 def compute_demand(
     prices,
     innovation,
     base_demand=1000,
     price_elasticity=1.5,
-    innovation_weight=0.3
+    innovation_weight=0.3,
+    out=None
 ):
     """
     Computes firm-level demand and market shares in a competitive market.
@@ -23,6 +32,9 @@ def compute_demand(
         Sensitivity of demand to price differences.
     innovation_weight : float
         Weight of innovation in consumer preference.
+    out : tuple of np.ndarray, optional
+        Preallocated ``(firm_demand, market_share)`` float arrays to write
+        into, so a rollout loop can reuse the same buffers every step.
 
     Returns
     -------
@@ -32,13 +44,85 @@ def compute_demand(
         Market share of each firm.
     """
 
-    n_firms = len(prices)
+    prices = np.asarray(prices, dtype=float)
+    innovation = np.asarray(innovation, dtype=float)
+
+    if out is None:
+        firm_demand = np.empty(len(prices))
+        market_share = np.empty(len(prices))
+    else:
+        firm_demand, market_share = out
 
-    # Normalize innovation to avoid scale dominance
-    if np.sum(innovation) > 0:
-        norm_innovation = innovation / np.max(innovation)
+    # Normalized innovation + softmax choice model (see _kernels): the
+    # compiled loop if Numba is available, else scalar Python for small
+    # markets and vectorized NumPy for larger ones
+    if HAS_NUMBA:
+        kernel = demand_kernel
+    elif len(prices) <= SMALL_MARKET_FIRMS:
+        kernel = demand_kernel_small
     else:
-        norm_innovation = np.zeros(n_firms)
+        kernel = demand_kernel_numpy
+
+    kernel(
+        prices,
+        innovation,
+        float(base_demand),
+        float(price_elasticity),
+        float(innovation_weight),
+        firm_demand,
+        market_share,
+    )
+
+    return firm_demand, market_share
+
+
+def compute_demand_batch(
+    prices,
+    innovation,
+    base_demand=1000,
+    price_elasticity=1.5,
+    innovation_weight=0.3
+):
+    """
+    Computes firm-level demand and market shares for a batch of markets.
+
+    Vectorized equivalent of ``compute_demand`` applied row by row, so a
+    whole rollout (or many episodes) is evaluated in one call. Firms are
+    on the last axis; any leading axes (e.g. episode x step) are batch
+    axes.
+
+    Parameters
+    ----------
+    prices : np.ndarray
+        Firm prices, shape (..., n_firms).
+    innovation : np.ndarray
+        Cumulative innovation levels, shape (..., n_firms).
+    base_demand : float or np.ndarray
+        Total market demand, scalar or shape (...,).
+    price_elasticity : float
+        Sensitivity of demand to price differences.
+    innovation_weight : float
+        Weight of innovation in consumer preference.
+
+    Returns
+    -------
+    firm_demand : np.ndarray
+        Quantity demanded for each firm, shape (..., n_firms).
+    market_share : np.ndarray
+        Market share of each firm, shape (..., n_firms).
+    """
+
+    prices = np.asarray(prices, dtype=float)
+    innovation = np.asarray(innovation, dtype=float)
+
+    # Normalize innovation per market (rows without innovation stay at zero)
+    max_innovation = innovation.max(axis=-1, keepdims=True)
+    norm_innovation = np.divide(
+        innovation,
+        max_innovation,
+        out=np.zeros_like(innovation),
+        where=max_innovation > 0,
+    )
 
     # Consumer utility (lower price + higher innovation = higher utility)
     utility = (
@@ -46,11 +130,107 @@ def compute_demand(
         + innovation_weight * norm_innovation
     )
 
-    # Softmax choice model for market share
-    exp_utility = np.exp(utility - np.max(utility))
-    market_share = exp_utility / np.sum(exp_utility)
+    # Softmax choice model for market share, computed in place
+    utility -= utility.max(axis=-1, keepdims=True)
+    exp_utility = np.exp(utility, out=utility)
+    market_share = exp_utility / exp_utility.sum(axis=-1, keepdims=True)
 
     # Allocate total demand
+    base_demand = np.asarray(base_demand, dtype=float)
+    if base_demand.ndim > 0:
+        base_demand = base_demand[..., None]
     firm_demand = base_demand * market_share
 
     return firm_demand, market_share
+
+
+class DemandModel:
+    """
+    Stateful demand model for step-by-step rollouts.
+
+    Innovation stocks change far less often than prices, so the
+    innovation utility term is cached and only refreshed through
+    ``update_innovation``. Each ``compute`` call adds the price term and
+    applies the softmax in place on preallocated buffers.
+
+    Parameters
+    ----------
+    n_firms : int
+        Number of firms in the market.
+    base_demand : float
+        Total market demand.
+    price_elasticity : float
+        Sensitivity of demand to price differences.
+    innovation_weight : float
+        Weight of innovation in consumer preference.
+    """
+
+    def __init__(
+        self,
+        n_firms,
+        base_demand=1000,
+        price_elasticity=1.5,
+        innovation_weight=0.3
+    ):
+        self.n_firms = n_firms
+        self.base_demand = base_demand
+        self.price_elasticity = price_elasticity
+        self.innovation_weight = innovation_weight
+
+        self._innovation_term = np.zeros(n_firms)
+        self._utility = np.empty(n_firms)
+        self.firm_demand = np.empty(n_firms)
+        self.market_share = np.empty(n_firms)
+
+    def update_innovation(self, innovation):
+        """
+        Refreshes the cached innovation utility term.
+
+        Parameters
+        ----------
+        innovation : np.ndarray
+            Array of cumulative innovation levels.
+        """
+
+        innovation = np.asarray(innovation, dtype=float)
+
+        # Normalize innovation to avoid scale dominance
+        if np.sum(innovation) > 0:
+            np.multiply(
+                innovation,
+                self.innovation_weight / np.max(innovation),
+                out=self._innovation_term,
+            )
+        else:
+            self._innovation_term.fill(0.0)
+
+    def compute(self, prices):
+        """
+        Computes demand and market shares for the given prices.
+
+        Parameters
+        ----------
+        prices : np.ndarray
+            Array of firm prices.
+
+        Returns
+        -------
+        firm_demand : np.ndarray
+            Quantity demanded for each firm (buffer reused across calls).
+        market_share : np.ndarray
+            Market share of each firm (buffer reused across calls).
+        """
+
+        utility = self._utility
+        np.multiply(prices, -self.price_elasticity, out=utility)
+        utility += self._innovation_term
+
+        # Softmax choice model for market share
+        utility -= utility.max()
+        np.exp(utility, out=utility)
+        np.divide(utility, utility.sum(), out=self.market_share)
+
+        # Allocate total demand
+        np.multiply(self.market_share, self.base_demand, out=self.firm_demand)
+
+        return self.firm_demand, self.market_share
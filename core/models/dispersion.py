@@ -0,0 +1,40 @@
+import numpy as np
+
+from core.models._kernels import HAS_NUMBA, group_std_kernel, group_std_kernel_numpy
+
+
+def price_dispersion(
+    prices,
+    group_ids,
+    n_groups
+):
+    """
+    Computes price dispersion (sample standard deviation) per group.
+
+    Deviations are taken from each group's mean, which stays accurate when
+    prices are large relative to their spread.
+
+    Parameters
+    ----------
+    prices : np.ndarray
+        Observed prices (one row per firm-observation).
+    group_ids : np.ndarray
+        Integer group index in ``[0, n_groups)`` for each row, e.g. the
+        factorized episode or step of each observation.
+    n_groups : int
+        Number of groups.
+
+    Returns
+    -------
+    dispersion : np.ndarray
+        Standard deviation (ddof=1) of prices in each group; NaN for
+        groups with fewer than two rows.
+    """
+
+    prices = np.asarray(prices, dtype=float)
+    group_ids = np.asarray(group_ids, dtype=np.int64)
+
+    # Compiled loop if Numba is available, else bincount-based NumPy
+    kernel = group_std_kernel if HAS_NUMBA else group_std_kernel_numpy
+
+    return kernel(group_ids, prices, int(n_groups))
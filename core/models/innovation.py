@@ -24,6 +24,9 @@ def innovation_effect(
         Innovation multiplier applied to demand or cost.
     """
 
+    # Plain NumPy on purpose: an njit kernel needs np.asarray coercion and an
+    # output buffer, which costs more than np.log1p itself at every input
+    # size (scalar, a few firms, or long arrays)
     if diminishing_returns:
         # Log-based diminishing returns
         effect = max_effect * np.log1p(cumulative_innovation)
@@ -1,10 +1,30 @@
 import numpy as np
 
+# Module-level generator (avoids the legacy global RandomState per call);
+# reseed with seed() or pass rng= for reproducible shocks
+_rng = np.random.default_rng()
+
+
+def seed(seed=None):
+    """
+    Reseeds the module-level shock generator.
+
+    Parameters
+    ----------
+    seed : int, optional
+        Seed for ``np.random.default_rng`` (fresh entropy if None).
+    """
+
+    global _rng
+    _rng = np.random.default_rng(seed)
+
 
 def demand_shock(
     base_demand,
     shock_std=0.05,
-    active=True
+    active=True,
+    size=None,
+    rng=None
 ):
     """
     Applies a stochastic demand shock.
@@ -17,26 +37,40 @@ def demand_shock(
         Standard deviation of demand shock.
     active : bool
         Whether shocks are enabled.
+    size : int, optional
+        Number of shocks to draw at once (e.g. one per rollout step).
+        If None, a single shock is drawn.
+    rng : np.random.Generator, optional
+        Generator to draw from (defaults to the module generator).
 
     Returns
     -------
-    shocked_demand : float
-        Adjusted market demand.
+    shocked_demand : float or np.ndarray
+        Adjusted market demand (array of length ``size`` if given).
     """
 
     if not active:
-        return base_demand
+        if size is None:
+            return base_demand
+        return np.full(size, base_demand, dtype=float)
 
-    shock = np.random.normal(loc=0.0, scale=shock_std)
+    if rng is None:
+        rng = _rng
+
+    shock = rng.standard_normal(size) * shock_std
     shocked_demand = base_demand * (1 + shock)
 
-    return max(shocked_demand, 0.0)
+    if size is None:
+        return max(shocked_demand, 0.0)
+    return np.maximum(shocked_demand, 0.0)
 
 
 def cost_shock(
     marginal_cost,
     shock_std=0.03,
-    active=True
+    active=True,
+    size=None,
+    rng=None
 ):
     """
     Applies a stochastic cost shock.
@@ -49,17 +83,29 @@ def cost_shock(
         Standard deviation of cost shock.
     active : bool
         Whether shocks are enabled.
+    size : int, optional
+        Number of shocks to draw at once (e.g. one per rollout step).
+        If None, a single shock is drawn.
+    rng : np.random.Generator, optional
+        Generator to draw from (defaults to the module generator).
 
     Returns
     -------
-    shocked_cost : float
-        Adjusted marginal cost.
+    shocked_cost : float or np.ndarray
+        Adjusted marginal cost (array of length ``size`` if given).
     """
 
     if not active:
-        return marginal_cost
+        if size is None:
+            return marginal_cost
+        return np.full(size, marginal_cost, dtype=float)
+
+    if rng is None:
+        rng = _rng
 
-    shock = np.random.normal(loc=0.0, scale=shock_std)
+    shock = rng.standard_normal(size) * shock_std
     shocked_cost = marginal_cost * (1 + shock)
 
-    return max(shocked_cost, 0.0)
+    if size is None:
+        return max(shocked_cost, 0.0)
+    return np.maximum(shocked_cost, 0.0)
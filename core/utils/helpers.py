@@ -0,0 +1,76 @@
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+
+# Parquet needs pyarrow; without it we always parse the CSV
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def read_csv_cached(
+    csv_path,
+    columns=None,
+    dtype=None
+):
+    """
+    Reads a CSV through a Parquet sidecar cache.
+
+    The first read parses the CSV (with ``dtype`` applied while parsing)
+    and writes every column to ``<name>.parquet`` next to it. Later reads load the Parquet file (column-pruned) as long as it is
+    newer than the CSV; a sidecar that cannot be read with the requested
+    columns (e.g. written from an older CSV schema) is rebuilt from the
+    CSV. Without pyarrow installed the CSV is parsed every time.
+
+    Parameters
+    ----------
+    csv_path : str or Path
+        Path to the CSV file.
+    columns : list of str, optional
+        Subset of columns to return (all columns if None).
+    dtype : dict, optional
+        Column dtypes to apply to the returned frame (columns that are
+        not present are ignored).
+
+    Returns
+    -------
+    df : pd.DataFrame
+        Loaded data.
+    """
+
+    csv_path = Path(csv_path)
+
+    if not _HAS_PYARROW:
+        return pd.read_csv(csv_path, usecols=columns, dtype=dtype)
+
+    from pyarrow import ArrowException
+
+    parquet_path = csv_path.with_suffix(".parquet")
+
+    if (
+        parquet_path.exists()
+        and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+    ):
+        try:
+            return _apply_dtype(pd.read_parquet(parquet_path, columns=columns), dtype)
+        except (KeyError, ValueError, TypeError, ArrowException):
+            pass  # Unreadable or old-schema sidecar: rebuild it from the CSV
+
+    # Parse with the requested dtypes, but keep every column in the cache
+    # so callers asking for other columns can reuse it
+    df = pd.read_csv(csv_path, dtype=dtype)
+    try:
+        df.to_parquet(parquet_path, index=False)
+    except (OSError, ValueError, TypeError, ArrowException):
+        # Read-only location or unsupported data: skip the cache
+        parquet_path.unlink(missing_ok=True)
+    if columns is not None:
+        df = df[columns]
+
+    return _apply_dtype(df, dtype)
+
+
+def _apply_dtype(df, dtype):
+    """Applies ``dtype`` to the columns present, like ``read_csv(dtype=...)``."""
+    if dtype is None:
+        return df
+    return df.astype({col: dtype[col] for col in dtype if col in df.columns})
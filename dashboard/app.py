@@ -36,6 +36,53 @@ st.set_page_config(
 # =========================================================
 st.markdown(styling.CUSTOM_CSS, unsafe_allow_html=True)
 
+# =========================================================
+# CACHED DATA ACCESS
+# =========================================================
+@st.cache_data(show_spinner=False)
+def load_tournament(version, modified_time):
+    """
+    Load tournament data and its market summary
+    
+    Memoized per version and CSV modification time, so reruns and reloads
+    of unchanged results skip both the file read and the aggregations.
+    """
+    df = data_loader.load_tournament_data(version)
+    if df is None:
+        return None, None
+    return df, data_loader.get_market_summary(df)
+
+def get_tournament_mtime(version):
+    """Modification time of the tournament CSV (None if missing)"""
+    csv_path = data_loader.get_tournament_path(version)
+    return csv_path.stat().st_mtime if csv_path.exists() else None
+
+@st.cache_resource(show_spinner=False)
+def build_all_figures(version, modified_time):
+    """
+    Build every chart for a tournament dataset once, at load time
+    
+    Figures are shared across reruns and sessions for the same version and
+    CSV modification time (st.plotly_chart only reads them), so toggling
+    charts never rebuilds a figure. The per-step panels and the final-step
+    slice are computed once here and shared by all chart builders.
+    """
+    df, _ = load_tournament(version, modified_time)
+    agents = data_loader.get_agents(df)
+    agent_panel, step_panel = charts.aggregate_panel(df)
+    final_data = charts.final_snapshot(df)
+    return {
+        'prices': charts.render_price_chart(agent_panel, step_panel, agents),
+        'profits': charts.render_profit_chart(agent_panel, agents),
+        'shares': charts.render_market_share_chart(agent_panel, agents),
+        'innovation': charts.render_innovation_chart(agent_panel, agents),
+        'hhi': charts.render_hhi_chart(step_panel),
+        'dispersion': charts.render_price_dispersion_chart(step_panel),
+        'final_shares': charts.render_final_shares_bar(final_data),
+        'profit_distribution': charts.render_profit_distribution_bar(df),
+        'innovation_vs_share': charts.render_innovation_vs_share_scatter(final_data, agents),
+    }
+
 # =========================================================
 # INITIALIZE SESSION STATE
 # =========================================================
@@ -45,6 +92,8 @@ if 'df' not in st.session_state:
     st.session_state.df = None
 if 'summary' not in st.session_state:
     st.session_state.summary = None
+if 'data_key' not in st.session_state:
+    st.session_state.data_key = None
 
 # =========================================================
 # SIDEBAR CONTROLS
@@ -108,7 +157,11 @@ if not st.session_state.data_loaded:
     if run_clicked:
         # Load data
         with st.spinner(f"Loading tournament data from {sidebar_state['version']}..."):
-            df = data_loader.load_tournament_data(sidebar_state['version'])
+            data_key = (
+                sidebar_state['version'],
+                get_tournament_mtime(sidebar_state['version'])
+            )
+            df, market_summary = load_tournament(*data_key)
             
             if df is None:
                 st.error(f"""
@@ -123,19 +176,19 @@ if not st.session_state.data_loaded:
                 ```
                 """)
             else:
-                # Calculate summary
-                market_summary = data_loader.get_market_summary(df)
-                
                 # Store in session state
                 st.session_state.df = df
                 st.session_state.summary = market_summary
+                st.session_state.data_key = data_key
                 st.session_state.data_loaded = True
+                build_all_figures(*data_key)
                 st.rerun()
 
 else:
     # Data is loaded - show active market
     df = st.session_state.df
     market_summary = st.session_state.summary
+    figures = build_all_figures(*st.session_state.data_key)
     
     # Active market visualization
     market_view.render_active_market(market_summary)
@@ -176,11 +229,11 @@ else:
         
         with col1:
             if chart_toggles['prices']:
-                st.plotly_chart(charts.render_price_chart(df), use_container_width=True)
+                st.plotly_chart(figures['prices'], use_container_width=True)
         
         with col2:
             if chart_toggles['profits']:
-                st.plotly_chart(charts.render_profit_chart(df), use_container_width=True)
+                st.plotly_chart(figures['profits'], use_container_width=True)
     
     # Row 2: Market Share and Innovation
     if chart_toggles['shares'] or chart_toggles['innovation']:
@@ -188,11 +241,11 @@ else:
         
         with col1:
             if chart_toggles['shares']:
-                st.plotly_chart(charts.render_market_share_chart(df), use_container_width=True)
+                st.plotly_chart(figures['shares'], use_container_width=True)
         
         with col2:
             if chart_toggles['innovation']:
-                st.plotly_chart(charts.render_innovation_chart(df), use_container_width=True)
+                st.plotly_chart(figures['innovation'], use_container_width=True)
     
     # Row 3: HHI and Price Dispersion
     if chart_toggles['hhi'] or chart_toggles['dispersion']:
@@ -200,11 +253,11 @@ else:
         
         with col1:
             if chart_toggles['hhi']:
-                st.plotly_chart(charts.render_hhi_chart(df), use_container_width=True)
+                st.plotly_chart(figures['hhi'], use_container_width=True)
         
         with col2:
             if chart_toggles['dispersion']:
-                st.plotly_chart(charts.render_price_dispersion_chart(df), use_container_width=True)
+                st.plotly_chart(figures['dispersion'], use_container_width=True)
     
     st.markdown("---")
     
@@ -216,13 +269,13 @@ else:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.plotly_chart(charts.render_final_shares_bar(df), use_container_width=True)
+        st.plotly_chart(figures['final_shares'], use_container_width=True)
     
     with col2:
-        st.plotly_chart(charts.render_profit_distribution_bar(df), use_container_width=True)
+        st.plotly_chart(figures['profit_distribution'], use_container_width=True)
     
     with col3:
-        st.plotly_chart(charts.render_innovation_vs_share_scatter(df), use_container_width=True)
+        st.plotly_chart(figures['innovation_vs_share'], use_container_width=True)
     
     st.markdown("---")
     
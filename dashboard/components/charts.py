@@ -1,34 +1,97 @@
 """
 Interactive time-series charts using Plotly
+
+Chart builders are pure functions of shared aggregates, not of the raw
+tournament DataFrame: app.build_all_figures computes the per-step panels
+(aggregate_panel) and the final-step slice (final_snapshot) once per
+dataset, passes them to every builder and shares the resulting figures.
 """
-import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-from dashboard.utils.styling import COLORS, get_chart_layout
+import numpy as np
+from dashboard.utils.styling import COLORS, get_agent_colors, get_chart_layout
 from dashboard.utils.data_loader import calculate_hhi
+from core.models.dispersion import price_dispersion
 
-def render_price_chart(df):
-    """Price over time for all firms"""
+def aggregate_panel(df):
+    """
+    Per-step aggregates shared by the time-series charts
+    
+    One groupby over (step, agent) for the per-firm series and one over
+    step for the market-wide series, instead of a groupby in every chart.
+    
+    Returns:
+        agent_panel: Per-(step, agent) mean price, cum_profit, market_share
+            and innovation_stock
+        step_panel: Per-step mean marginal_cost, economic_regime, price_std
+            and mean HHI across episodes
+    """
+    # Hash groupbys without key sorting; only the small results are sorted
+    agent_panel = df.groupby(['step', 'agent'], observed=True, sort=False)[
+        ['price', 'cum_profit', 'market_share', 'innovation_stock']
+    ].mean().sort_index()
+    step_panel = df.groupby('step', observed=True, sort=False).agg(
+        marginal_cost=('marginal_cost', 'mean'),
+        economic_regime=('economic_regime', 'first'),
+    ).sort_index()
+    
+    # Per-step price std (ddof=1), indexed directly by step number
+    steps = df['step'].to_numpy()
+    price_std = price_dispersion(df['price'].to_numpy(), steps, steps.max() + 1)
+    step_panel['price_std'] = price_std[step_panel.index]
+    
+    # Average HHI across episodes
+    hhi_df = calculate_hhi(df)
+    step_panel['hhi'] = hhi_df.groupby('step', observed=True, sort=False)['hhi'].mean()
+    
+    return agent_panel, step_panel
+
+def final_snapshot(df):
+    """Rows of the final step (every episode), shared by the final-state charts"""
+    final_step = df['step'].max()
+    return df.loc[df['step'].to_numpy() == final_step]
+
+def _render_time_series(agent_panel, agents, column, title, yaxis_title, hover_value, fill_between=False):
+    """
+    Per-firm line chart of a per-step average across episodes
+    
+    Args:
+        column: Column of agent_panel to plot
+        hover_value: Hover label for the value, e.g. 'Price: $%{y:.2f}'
+        fill_between: Fill each firm's area down to the previous firm's line
+    """
     fig = go.Figure()
     
-    for agent in df['agent'].unique():
-        agent_data = df[df['agent'] == agent]
-        color = COLORS.get(agent, COLORS['neon_purple'])
-        
-        # Average price per step across all episodes
-        avg_prices = agent_data.groupby('step')['price'].mean()
+    agent_colors = get_agent_colors(agents)
+    traces = []
+    for i, agent in enumerate(agents):
+        avg_values = agent_panel[column].xs(agent, level='agent')
         
-        fig.add_trace(go.Scatter(
-            x=avg_prices.index,
-            y=avg_prices.values,
+        traces.append(go.Scatter(
+            x=avg_values.index,
+            y=avg_values.values,
             name=agent,
-            line=dict(color=color, width=3),
+            line=dict(color=agent_colors[agent], width=3),
             mode='lines',
-            hovertemplate=f'<b>{agent}</b><br>Step: %{{x}}<br>Price: $%{{y:.2f}}<extra></extra>'
+            fill='tonexty' if fill_between and i > 0 else None,
+            hovertemplate=f'<b>{agent}</b><br>Step: %{{x}}<br>{hover_value}<extra></extra>'
         ))
     
+    fig.add_traces(traces)
+    
+    layout = get_chart_layout(title=title, height=400)
+    layout['yaxis']['title'] = yaxis_title
+    layout['xaxis']['title'] = 'Time Step'
+    fig.update_layout(**layout)
+    
+    return fig
+
+def render_price_chart(agent_panel, step_panel, agents):
+    """Price over time for all firms"""
+    fig = _render_time_series(agent_panel, agents, 'price', "Prices Over Time", 'Price ($)', 'Price: $%{y:.2f}')
+    
     # Add marginal cost reference line
-    avg_cost = df.groupby('step')['marginal_cost'].mean()
+    avg_cost = step_panel['marginal_cost']
     fig.add_trace(go.Scatter(
         x=avg_cost.index,
         y=avg_cost.values,
@@ -38,65 +101,46 @@ def render_price_chart(df):
         hovertemplate='Marginal Cost: $%{y:.2f}<extra></extra>'
     ))
     
-    layout = get_chart_layout(title="Prices Over Time", height=400)
-    layout['yaxis']['title'] = 'Price ($)'
-    layout['xaxis']['title'] = 'Time Step'
-    fig.update_layout(**layout)
-    
     return fig
 
-def render_profit_chart(df):
+def render_profit_chart(agent_panel, agents):
     """Cumulative profit over time"""
-    fig = go.Figure()
-    
-    for agent in df['agent'].unique():
-        agent_data = df[df['agent'] == agent]
-        color = COLORS.get(agent, COLORS['neon_purple'])
-        
-        # Average cumulative profit per step
-        avg_profit = agent_data.groupby('step')['cum_profit'].mean()
-        
-        fig.add_trace(go.Scatter(
-            x=avg_profit.index,
-            y=avg_profit.values,
-            name=agent,
-            line=dict(color=color, width=3),
-            mode='lines',
-            fill='tonexty' if agent != df['agent'].unique()[0] else None,
-            hovertemplate=f'<b>{agent}</b><br>Step: %{{x}}<br>Profit: $%{{y:.0f}}<extra></extra>'
-        ))
-    
-    layout = get_chart_layout(title="Cumulative Profit Over Time", height=400)
-    layout['yaxis']['title'] = 'Cumulative Profit ($)'
-    layout['xaxis']['title'] = 'Time Step'
-    fig.update_layout(**layout)
-    
-    return fig
+    return _render_time_series(
+        agent_panel, agents, 'cum_profit', "Cumulative Profit Over Time", 'Cumulative Profit ($)',
+        'Profit: $%{y:.0f}', fill_between=True,
+    )
 
-def render_market_share_chart(df):
+def render_market_share_chart(agent_panel, agents):
     """Market share evolution (stacked area)"""
     fig = go.Figure()
     
     # Prepare data for stacked area
-    agents = sorted(df['agent'].unique())
+    agents = sorted(agents)
+    agent_colors = get_agent_colors(agents)
     
-    for agent in agents:
-        agent_data = df[df['agent'] == agent]
-        color = COLORS.get(agent, COLORS['neon_purple'])
-        
-        avg_share = agent_data.groupby('step')['market_share'].mean()
+    # Stack server-side: each trace is the cumulative share up to that firm,
+    # filled down to the previous trace (hover shows the firm's own share)
+    shares = agent_panel['market_share'].unstack('agent')[agents] * 100  # Convert to percentage
+    stacked_shares = shares.cumsum(axis=1)
+    
+    traces = []
+    for i, agent in enumerate(agents):
+        color = agent_colors[agent]
         
-        fig.add_trace(go.Scatter(
-            x=avg_share.index,
-            y=avg_share.values * 100,  # Convert to percentage
+        traces.append(go.Scatter(
+            x=stacked_shares.index,
+            y=stacked_shares[agent].values,
+            customdata=shares[agent].values,
             name=agent,
             line=dict(color=color, width=2),
             mode='lines',
-            stackgroup='one',
+            fill='tozeroy' if i == 0 else 'tonexty',
             fillcolor=color,
-            hovertemplate=f'<b>{agent}</b><br>Step: %{{x}}<br>Share: %{{y:.1f}}%<extra></extra>'
+            hovertemplate=f'<b>{agent}</b><br>Step: %{{x}}<br>Share: %{{customdata:.1f}}%<extra></extra>'
         ))
     
+    fig.add_traces(traces)
+    
     layout = get_chart_layout(title="Market Share Over Time", height=400)
     layout['yaxis']['title'] = 'Market Share (%)'
     layout['xaxis']['title'] = 'Time Step'
@@ -105,40 +149,19 @@ def render_market_share_chart(df):
     
     return fig
 
-def render_innovation_chart(df):
+def render_innovation_chart(agent_panel, agents):
     """Innovation stock over time"""
-    fig = go.Figure()
-    
-    for agent in df['agent'].unique():
-        agent_data = df[df['agent'] == agent]
-        color = COLORS.get(agent, COLORS['neon_purple'])
-        
-        avg_innovation = agent_data.groupby('step')['innovation_stock'].mean()
-        
-        fig.add_trace(go.Scatter(
-            x=avg_innovation.index,
-            y=avg_innovation.values,
-            name=agent,
-            line=dict(color=color, width=3),
-            mode='lines',
-            hovertemplate=f'<b>{agent}</b><br>Step: %{{x}}<br>Innovation: %{{y:.2f}}<extra></extra>'
-        ))
-    
-    layout = get_chart_layout(title="Innovation Stock Over Time", height=400)
-    layout['yaxis']['title'] = 'Innovation Stock'
-    layout['xaxis']['title'] = 'Time Step'
-    fig.update_layout(**layout)
-    
-    return fig
+    return _render_time_series(
+        agent_panel, agents, 'innovation_stock', "Innovation Stock Over Time", 'Innovation Stock',
+        'Innovation: %{y:.2f}',
+    )
 
-def render_hhi_chart(df):
+def render_hhi_chart(step_panel):
     """HHI (market concentration) over time with regime overlay"""
-    hhi_df = calculate_hhi(df)
-    
     fig = go.Figure()
     
     # Average HHI across episodes
-    avg_hhi = hhi_df.groupby('step')['hhi'].mean()
+    avg_hhi = step_panel['hhi']
     
     fig.add_trace(go.Scatter(
         x=avg_hhi.index,
@@ -158,21 +181,21 @@ def render_hhi_chart(df):
                   annotation_text="Monopolistic", annotation_position="right")
     
     # Add economic regime shading
-    regime_data = df.groupby('step')['economic_regime'].first()
-    
-    # Identify boom/recession periods
-    for step in regime_data.index:
-        regime = regime_data[step]
-        if regime == 'boom':
+    regime_data = step_panel['economic_regime']
+    regime_colors = {'boom': COLORS['neon_cyan'], 'recession': COLORS['neon_pink']}
+    
+    # One rectangle per contiguous boom/recession period (not per step)
+    steps = regime_data.index.to_numpy()
+    regimes = regime_data.to_numpy()
+    run_starts = np.flatnonzero(np.r_[True, regimes[1:] != regimes[:-1]])
+    run_ends = np.r_[run_starts[1:], len(regimes)] - 1
+    
+    for start, end in zip(run_starts, run_ends):
+        color = regime_colors.get(regimes[start])
+        if color is not None:
             fig.add_vrect(
-                x0=step-0.5, x1=step+0.5,
-                fillcolor=COLORS['neon_cyan'], opacity=0.05,
-                layer="below", line_width=0,
-            )
-        elif regime == 'recession':
-            fig.add_vrect(
-                x0=step-0.5, x1=step+0.5,
-                fillcolor=COLORS['neon_pink'], opacity=0.05,
+                x0=steps[start]-0.5, x1=steps[end]+0.5,
+                fillcolor=color, opacity=0.05,
                 layer="below", line_width=0,
             )
     
@@ -184,9 +207,9 @@ def render_hhi_chart(df):
     
     return fig
 
-def render_price_dispersion_chart(df):
+def render_price_dispersion_chart(step_panel):
     """Price dispersion (std dev) over time - indicates price wars"""
-    price_std = df.groupby('step')['price'].std()
+    price_std = step_panel['price_std']
     
     fig = go.Figure()
     
@@ -212,19 +235,17 @@ def render_price_dispersion_chart(df):
     
     return fig
 
-def render_innovation_vs_share_scatter(df):
-    """Scatter plot: Innovation vs Market Share"""
+def render_innovation_vs_share_scatter(final_data, agents):
+    """Scatter plot: Innovation vs Market Share (final state per firm per episode)"""
     fig = go.Figure()
     
-    # Get final state per firm per episode
-    final_step = df['step'].max()
-    final_data = df[df['step'] == final_step]
-    
-    for agent in df['agent'].unique():
+    agent_colors = get_agent_colors(agents)
+    traces = []
+    for agent in agents:
         agent_final = final_data[final_data['agent'] == agent]
-        color = COLORS.get(agent, COLORS['neon_purple'])
+        color = agent_colors[agent]
         
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scatter(
             x=agent_final['innovation_stock'],
             y=agent_final['market_share'] * 100,
             name=agent,
@@ -237,6 +258,8 @@ def render_innovation_vs_share_scatter(df):
             hovertemplate=f'<b>{agent}</b><br>Innovation: %{{x:.2f}}<br>Share: %{{y:.1f}}%<extra></extra>'
         ))
     
+    fig.add_traces(traces)
+    
     layout = get_chart_layout(title="Innovation vs Market Share", height=400)
     layout['xaxis']['title'] = 'Innovation Stock'
     layout['yaxis']['title'] = 'Market Share (%)'
@@ -244,16 +267,13 @@ def render_innovation_vs_share_scatter(df):
     
     return fig
 
-def render_final_shares_bar(df):
+def render_final_shares_bar(final_data):
     """Bar chart of final market shares"""
-    final_step = df['step'].max()
-    final_data = df[df['step'] == final_step]
-    
-    avg_shares = final_data.groupby('agent')['market_share'].mean() * 100
+    avg_shares = final_data.groupby('agent', observed=True, sort=False)['market_share'].mean() * 100
     
     fig = go.Figure()
     
-    colors = [COLORS.get(agent, COLORS['neon_purple']) for agent in avg_shares.index]
+    colors = list(get_agent_colors(avg_shares.index).values())
     
     fig.add_trace(go.Bar(
         x=avg_shares.index,
@@ -278,12 +298,12 @@ def render_final_shares_bar(df):
 
 def render_profit_distribution_bar(df):
     """Bar chart of average episode profits"""
-    episode_profits = df.groupby(['episode', 'agent'])['cum_profit'].max()
-    avg_profits = episode_profits.groupby('agent').mean()
+    episode_profits = df.groupby(['episode', 'agent'], observed=True, sort=False)['cum_profit'].max()
+    avg_profits = episode_profits.groupby('agent', observed=True, sort=False).mean()
     
     fig = go.Figure()
     
-    colors = [COLORS.get(agent, COLORS['neon_purple']) for agent in avg_profits.index]
+    colors = list(get_agent_colors(avg_profits.index).values())
     
     fig.add_trace(go.Bar(
         x=avg_profits.index,
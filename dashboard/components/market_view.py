@@ -4,7 +4,7 @@ Shows baseline market → run simulation → agent representation
 """
 import streamlit as st
 import plotly.graph_objects as go
-from dashboard.utils.styling import COLORS, get_chart_layout
+from dashboard.utils.styling import COLORS, get_agent_colors, get_chart_layout
 
 def render_baseline_market():
     """Render empty market state before simulation"""
@@ -90,6 +90,7 @@ def render_active_market(summary):
     st.markdown("### 🏭 Market Landscape")
     
     firms = summary['firms']
+    agent_colors = get_agent_colors(firm['agent'] for firm in firms)
     
     # Create market visualization with firm nodes
     fig = go.Figure()
@@ -97,7 +98,7 @@ def render_active_market(summary):
     # Position firms based on market share (y-axis) and innovation (x-axis)
     for i, firm in enumerate(firms):
         agent_name = firm['agent']
-        color = COLORS.get(agent_name, COLORS['neon_purple'])
+        color = agent_colors[agent_name]
         
         # Size based on market share
         size = 100 + (firm['final_share'] * 300)
@@ -3,7 +3,7 @@ Auto-generated summary component
 "What Happened in This Run?"
 """
 import streamlit as st
-from dashboard.utils.styling import COLORS
+from dashboard.utils.styling import COLORS, get_agent_colors
 
 def render_summary(summary):
     """Render auto-generated summary of simulation results"""
@@ -55,15 +55,16 @@ def render_summary(summary):
         
         st.markdown("---")
         
-        # All firms ranking
+        # All firms ranking (all cards in a single markdown element)
         st.markdown("### 📊 Firm Rankings")
         
+        agent_colors = get_agent_colors(firm['agent'] for firm in summary['firms'])
+        ranking_cards = []
         for i, firm in enumerate(summary['firms'], 1):
             emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉"
-            color = COLORS.get(firm['agent'], COLORS['neon_purple'])
+            color = agent_colors[firm['agent']]
             
-            with st.container():
-                st.markdown(f"""
+            ranking_cards.append(f"""
                 <div style="background: {COLORS['background_secondary']}; border-left: 4px solid {color}; padding: 15px; border-radius: 8px; margin-bottom: 10px;">
                     <h4 style="margin: 0; color: {color};">{emoji} {firm['agent']} — {firm['strategy']}</h4>
                     <p style="margin: 5px 0; color: {COLORS['text_secondary']};">
@@ -72,7 +73,9 @@ def render_summary(summary):
                         Innovation: {firm['innovation']:.2f}
                     </p>
                 </div>
-                """, unsafe_allow_html=True)
+                """)
+        
+        st.markdown("".join(ranking_cards), unsafe_allow_html=True)
         
         st.markdown("---")
         
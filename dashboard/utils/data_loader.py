@@ -1,13 +1,39 @@
 """
 Data loading utilities for dashboard
 """
+import numpy as np
 import pandas as pd
 import os
 from pathlib import Path
 
+from core.models.concentration import herfindahl_index
+from core.models.dispersion import price_dispersion
+from core.utils.helpers import read_csv_cached
+
+# Compact dtypes for the dashboard aggregations (memory-bound)
+TOURNAMENT_DTYPES = {
+    'episode': 'int32',
+    'step': 'int32',
+    'price': 'float32',
+    'cum_profit': 'float32',
+    'market_share': 'float32',
+    'innovation_stock': 'float32',
+    'marginal_cost': 'float32',
+    'economic_regime': 'category',
+}
+
+def get_tournament_path(version='version1'):
+    """
+    Path to the tournament results CSV for a version
+    
+    Returns:
+        pathlib.Path (may not exist)
+    """
+    return Path(version) / 'experiments' / 'logs' / 'evaluation' / 'tournament_results.csv'
+
 def load_tournament_data(version='version1', experiment_name=None):
     """
-    Load tournament results CSV
+    Load tournament results CSV (cached as Parquet after the first load)
     
     Args:
         version: 'version1' or 'version2'
@@ -16,19 +42,34 @@ def load_tournament_data(version='version1', experiment_name=None):
     Returns:
         pd.DataFrame or None if file doesn't exist
     """
-    base_path = Path(version) / 'experiments' / 'logs' / 'evaluation'
-    csv_path = base_path / 'tournament_results.csv'
+    csv_path = get_tournament_path(version)
     
     if not csv_path.exists():
         return None
     
     try:
-        df = pd.read_csv(csv_path)
+        df = read_csv_cached(csv_path, dtype=TOURNAMENT_DTYPES)
+        # Categorical agent (first-appearance order) for cheap masks/groupbys
+        df['agent'] = pd.Categorical(df['agent'], categories=df['agent'].unique())
         return df
     except Exception as e:
         print(f"Error loading data: {e}")
         return None
 
+def get_agents(df):
+    """
+    Firm names in first-appearance order
+    
+    Reads the categories of a categorical `agent` column (no scan of the
+    data); falls back to `unique()` for plain columns.
+    
+    Returns:
+        List of agent names
+    """
+    if isinstance(df['agent'].dtype, pd.CategoricalDtype):
+        return df['agent'].cat.categories.tolist()
+    return df['agent'].unique().tolist()
+
 def get_available_experiments(version='version1'):
     """
     Scan for available experiment runs (future feature)
@@ -57,9 +98,13 @@ def calculate_hhi(df):
     Returns:
         pd.DataFrame with columns: episode, step, hhi
     """
-    hhi_data = df.groupby(['episode', 'step']).apply(
-        lambda x: (x['market_share'] ** 2).sum()
-    ).reset_index(name='hhi')
+    # One pass over the rows instead of a Python-level apply per group
+    group_ids, groups = pd.MultiIndex.from_arrays(
+        [df['episode'], df['step']]
+    ).factorize(sort=True)
+    
+    hhi_data = groups.to_frame(index=False, name=['episode', 'step'])
+    hhi_data['hhi'] = herfindahl_index(df['market_share'].to_numpy(), group_ids, len(groups))
     
     return hhi_data
 
@@ -72,31 +117,37 @@ def detect_price_wars(df, threshold=5.0):
     Returns:
         List of episode numbers with price wars
     """
-    price_dispersion = df.groupby('episode')['price'].std()
-    price_war_episodes = price_dispersion[price_dispersion > threshold].index.tolist()
+    group_ids, episodes = pd.factorize(df['episode'], sort=True)
+    dispersion = price_dispersion(df['price'].to_numpy(), group_ids, len(episodes))
+    price_war_episodes = episodes[dispersion > threshold].tolist()
     return price_war_episodes
 
-def classify_firm_strategy(agent_data):
+def classify_firm_strategy(avg_innovation, avg_price, avg_cost):
     """
-    Classify a firm's strategy based on behavior
+    Classify firms' strategies based on behavior
+    
+    Vectorized over firms: pass scalars for one firm or arrays with one
+    entry per firm.
+    
+    Args:
+        avg_innovation: Mean innovation stock per firm
+        avg_price: Mean price per firm
+        avg_cost: Mean marginal cost faced by each firm
     
     Returns:
-        String: 'Innovator', 'Price Warrior', 'Follower', 'Generic'
-    """
-    avg_innovation = agent_data['innovation_stock'].mean()
-    avg_price = agent_data['price'].mean()
-    avg_cost = agent_data['marginal_cost'].mean()
-    markup = ((avg_price - avg_cost) / avg_cost) * 100
-    
-    # Classification logic
-    if avg_innovation > 1.5:
-        return 'Innovation Leader'
-    elif avg_innovation > 0.5:
-        return 'Moderate Innovator'
-    elif markup < 5:
-        return 'Price Warrior'
-    else:
-        return 'Generic Follower'
+        np.ndarray of strategy names: 'Innovation Leader', 'Moderate Innovator',
+        'Price Warrior', 'Generic Follower'
+    """
+    avg_innovation = np.asarray(avg_innovation)
+    avg_cost = np.asarray(avg_cost)
+    markup = ((np.asarray(avg_price) - avg_cost) / avg_cost) * 100
+    
+    # Classification logic (first matching condition wins)
+    return np.select(
+        [avg_innovation > 1.5, avg_innovation > 0.5, markup < 5],
+        ['Innovation Leader', 'Moderate Innovator', 'Price Warrior'],
+        default='Generic Follower',
+    )
 
 def get_market_summary(df):
     """
@@ -106,22 +157,39 @@ def get_market_summary(df):
         dict with summary statistics and classifications
     """
     # Calculate key metrics
-    agents = df['agent'].unique()
+    agents = get_agents(df)
     final_step = df['step'].max()
     
+    # Per-firm aggregates in one groupby each, instead of a mask per firm
+    firm_stats = df.groupby('agent', observed=True, sort=False).agg(
+        avg_price=('price', 'mean'),
+        innovation=('innovation_stock', 'mean'),
+        avg_cost=('marginal_cost', 'mean'),
+    )
+    final_data = df.loc[df['step'].to_numpy() == final_step]
+    firm_stats['final_share'] = final_data.groupby('agent', observed=True, sort=False)['market_share'].mean()
+    firm_stats['total_profit'] = (
+        df.groupby(['episode', 'agent'], observed=True, sort=False)['cum_profit'].max()
+        .groupby('agent', observed=True, sort=False).mean()
+    )
+    firm_stats['strategy'] = classify_firm_strategy(
+        firm_stats['innovation'].to_numpy(),
+        firm_stats['avg_price'].to_numpy(),
+        firm_stats['avg_cost'].to_numpy(),
+    )
+    
     # Final state per firm
     firm_summaries = []
     for agent in agents:
-        agent_data = df[df['agent'] == agent]
-        final_data = agent_data[agent_data['step'] == final_step]
+        stats = firm_stats.loc[agent]
         
         summary = {
             'agent': agent,
-            'final_share': final_data['market_share'].mean(),
-            'total_profit': agent_data.groupby('episode')['cum_profit'].max().mean(),
-            'avg_price': agent_data['price'].mean(),
-            'innovation': agent_data['innovation_stock'].mean(),
-            'strategy': classify_firm_strategy(agent_data)
+            'final_share': stats['final_share'],
+            'total_profit': stats['total_profit'],
+            'avg_price': stats['avg_price'],
+            'innovation': stats['innovation'],
+            'strategy': stats['strategy']
         }
         firm_summaries.append(summary)
     
@@ -22,6 +22,10 @@ COLORS = {
     'firm_2': '#7DCFFF',  # Neon cyan
 }
 
+def get_agent_colors(agents):
+    """Map each agent to its theme color (neon purple for unknown agents)"""
+    return {agent: COLORS.get(agent, COLORS['neon_purple']) for agent in agents}
+
 # Chart layout template for Plotly
 def get_chart_layout(title="", height=400):
     """Standard layout for all Plotly charts"""
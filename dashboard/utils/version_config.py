@@ -62,13 +62,13 @@ def get_version_config(version_key):
     """Get configuration for specified version"""
     return VERSION_CONFIGS.get(version_key, VERSION_CONFIGS['version1'])
 
+# Columns that only Version 2 logs contain
+VERSION2_COLUMNS = frozenset(VERSION_CONFIGS['version2']['optional_columns'])
+
 def detect_version_from_columns(columns):
     """Auto-detect version based on available columns"""
-    columns_set = set(columns)
-    
-    # Check for Version 2 specific columns
-    v2_columns = {'is_bankrupt', 'entry_turn', 'human_decision'}
-    if v2_columns.intersection(columns_set):
+    # Check for Version 2 specific columns (stops at the first match)
+    if not VERSION2_COLUMNS.isdisjoint(columns):
         return 'version2'
     
     return 'version1'
@@ -0,0 +1,40 @@
+"""
+Shared helpers for running trained policies in MarketEnvMultiV1.
+"""
+
+import numpy as np
+
+
+def predict_actions(models: dict, observations: dict, deterministic: bool = True) -> dict:
+    """
+    Query every firm's policy, batching firms that share a model.
+
+    Firms mapped to the same model object are stacked into a single
+    (n_agents, obs_dim) predict call instead of one batch-of-1 call each.
+    Observations may also carry leading batch axes (e.g. one row per
+    market of a BatchedMarketEnv); they are flattened into the same call.
+
+    Args:
+        models: Dict[agent_name -> PPO model]
+        observations: Dict[agent_name -> observation, shape (..., obs_dim)]
+        deterministic: Whether to use deterministic actions
+
+    Returns:
+        actions: Dict[agent_name -> action, shape (..., action_dim)]
+    """
+    # Group agents by policy object, keeping agent order within each group
+    groups = {}
+    for agent, model in models.items():
+        groups.setdefault(id(model), (model, []))[1].append(agent)
+
+    actions = {}
+    for model, agents in groups.values():
+        obs_batch = np.stack([observations[agent] for agent in agents])
+        action_batch, _ = model.predict(
+            obs_batch.reshape(-1, obs_batch.shape[-1]), deterministic=deterministic
+        )
+        action_batch = action_batch.reshape(obs_batch.shape[:-1] + (-1,))
+        for agent, action in zip(agents, action_batch):
+            actions[agent] = action
+
+    return actions
@@ -10,10 +10,13 @@ from version1.env.v1_wrappers import make_v1_env
 
 
 def evaluate():
+    n_firms = 3
+    max_steps = 50
+
     # Create environment
     env = make_v1_env(
-        n_firms=3,
-        max_steps=50,
+        n_firms=n_firms,
+        max_steps=max_steps,
         num_envs=1,
         normalize_reward=False
     )
@@ -32,12 +35,13 @@ def evaluate():
 
     print("\n=== EVALUATING TRAINED STRATEGY ===\n")
     
-    n_firms = 3
-    all_prices = []
-    all_innovation = []
-    all_rewards = []
+    # Preallocated per-step buffers; row assignment copies by value
+    all_prices = np.empty((max_steps, n_firms), dtype=np.float32)
+    all_innovation = np.empty((max_steps, n_firms), dtype=np.float32)
+    all_rewards = np.empty(max_steps)
+    n_steps = 0
 
-    while step < 50:
+    while step < max_steps:
         action, _ = model.predict(obs, deterministic=True)
         # VecNormalize wraps step and returns only 4 values: obs, rewards, dones, infos
         result = env.step(action)
@@ -66,9 +70,10 @@ def evaluate():
         print(" Episode Reward    :", np.round(episode_reward, 2))
         print("-" * 40)
 
-        all_prices.append(prices.copy())
-        all_innovation.append(innovation.copy())
-        all_rewards.append(episode_reward)
+        all_prices[step] = prices
+        all_innovation[step] = innovation
+        all_rewards[step] = episode_reward
+        n_steps += 1
 
         if dones[0]:
             break
@@ -76,9 +81,9 @@ def evaluate():
         step += 1
 
     print("\n=== EVALUATION SUMMARY ===")
-    print(f"Average Price: {np.mean(all_prices):.2f}")
-    print(f"Average Innovation Spend: {np.mean(all_innovation):.2f}")
-    print(f"Total Cumulative Reward: {np.sum(all_rewards):.2f}")
+    print(f"Average Price: {np.mean(all_prices[:n_steps]):.2f}")
+    print(f"Average Innovation Spend: {np.mean(all_innovation[:n_steps]):.2f}")
+    print(f"Total Cumulative Reward: {np.sum(all_rewards[:n_steps]):.2f}")
     
     env.close()
 
@@ -12,6 +12,8 @@ import os
 import sys
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from stable_baselines3 import PPO
 
@@ -19,12 +21,13 @@ from stable_baselines3 import PPO
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from version1.env.market_env_multi_v1 import MarketEnvMultiV1
+from version1.agents.agent_utils import predict_actions
+from version1.env.market_env_multi_v1 import ECONOMIC_REGIMES, MarketEnvMultiV1
 
 
-def load_models(model_dir: str) -> dict:
+def find_model_paths(model_dir: str) -> dict:
     """
-    Load trained PPO models from directory.
+    Find the most recent saved model of each agent in a directory.
     
     Expected naming: firm_0_*.zip, firm_1_*.zip, firm_2_*.zip
     
@@ -32,48 +35,242 @@ def load_models(model_dir: str) -> dict:
         model_dir: Path to directory containing saved models
     
     Returns:
-        models: Dict[agent_name -> loaded model]
+        model_paths: Dict[agent_name -> model file path]
     """
     
-    models = {}
+    # One directory scan for all agents (DirEntry caches its stat result)
+    try:
+        with os.scandir(model_dir) as it:
+            zip_entries = [entry for entry in it if entry.name.endswith(".zip")]
+    except FileNotFoundError:
+        zip_entries = []
+    
+    model_paths = {}
     for agent_name in ["firm_0", "firm_1", "firm_2"]:
         # Find most recent model for this agent
         pattern = f"{agent_name}_*.zip"
-        matching_files = list(Path(model_dir).glob(pattern))
+        matching_files = [entry for entry in zip_entries if entry.name.startswith(f"{agent_name}_")]
         
         if not matching_files:
             raise FileNotFoundError(f"No models found matching {pattern} in {model_dir}")
         
         # Use most recently modified
-        latest_model = max(matching_files, key=lambda p: p.stat().st_mtime)
+        latest_model = max(matching_files, key=lambda entry: entry.stat().st_mtime)
         
-        print(f"Loading {agent_name} from {latest_model.name}")
-        models[agent_name] = PPO.load(str(latest_model))
+        model_paths[agent_name] = latest_model.path
+    
+    return model_paths
+
+
+def load_models(model_dir: str) -> dict:
+    """
+    Load trained PPO models from directory.
+    
+    Expected naming: firm_0_*.zip, firm_1_*.zip, firm_2_*.zip
+    
+    Args:
+        model_dir: Path to directory containing saved models
+    
+    Returns:
+        models: Dict[agent_name -> loaded model]
+    """
+    return load_model_files(find_model_paths(model_dir))
+
+
+def load_model_files(model_paths: dict) -> dict:
+    """
+    Load trained PPO models from their saved files.
+    
+    Agents that share a path share one loaded model, so their actions
+    are predicted in one batch.
+    
+    Args:
+        model_paths: Dict[agent_name -> model file path] (see find_model_paths)
+    
+    Returns:
+        models: Dict[agent_name -> loaded model]
+    """
+    
+    loaded = {}
+    models = {}
+    for agent_name, path in model_paths.items():
+        if path not in loaded:
+            print(f"Loading {agent_name} from {os.path.basename(path)}")
+            loaded[path] = PPO.load(path)
+        models[agent_name] = loaded[path]
     
     return models
 
 
+def run_episode(
+    models: dict,
+    episode: int,
+    n_episodes: int,
+    max_steps: int = 200,
+    render: bool = False,
+) -> pd.DataFrame:
+    """
+    Run a single tournament episode.
+    
+    Per-step values are written into preallocated (max_steps, n_agents)
+    arrays, one per logged column, and turned into a DataFrame once at
+    the end of the episode.
+    
+    Args:
+        models: Dict[agent_name -> PPO model]
+        episode: Episode index (used for logging)
+        n_episodes: Total number of episodes (used for progress output)
+        max_steps: Steps per episode
+        render: Whether to print market state each step
+    
+    Returns:
+        logs: DataFrame with one row per (step, agent)
+    """
+    
+    print(f"Episode {episode+1}/{n_episodes}")
+    
+    env = MarketEnvMultiV1(n_firms=3, max_steps=max_steps)
+    observations, _ = env.reset()
+    
+    agents = list(models.keys())
+    n_agents = len(agents)
+    
+    # Per-firm histories (step x agent) and market-wide histories (step).
+    # Env state and actions are float32 already; profits stay float64 for
+    # the cumulative sum.
+    prices = np.empty((max_steps, n_agents), dtype=np.float32)
+    rd_investments = np.empty((max_steps, n_agents), dtype=np.float32)
+    innovation_stocks = np.empty((max_steps, n_agents), dtype=np.float32)
+    market_shares = np.empty((max_steps, n_agents), dtype=np.float32)
+    marginal_costs = np.empty((max_steps, n_agents), dtype=np.float32)
+    profits = np.empty((max_steps, n_agents))
+    effective_demand = np.empty(max_steps, dtype=np.float32)
+    substitute_pressure = np.empty(max_steps, dtype=np.float32)
+    economic_regimes = np.empty(max_steps, dtype=object)
+    
+    # Actions of the current step (agent x [price, R&D]), reused every step
+    action_arr = np.empty((n_agents, 2), dtype=np.float32)
+    
+    n_steps = 0
+    for step in range(max_steps):
+        # Get actions from trained models (one predict per distinct model)
+        actions = predict_actions(models, observations, deterministic=True)
+        for i, agent in enumerate(agents):
+            action_arr[i] = actions[agent]
+        
+        # Step environment
+        observations, rewards, terminations, truncations, infos = env.step(
+            dict(zip(agents, action_arr))
+        )
+        
+        # Log state
+        prices[step] = env.prices
+        rd_investments[step] = action_arr[:, 1]
+        innovation_stocks[step] = env.innovation_stocks
+        market_shares[step] = env.market_shares
+        marginal_costs[step] = env.marginal_costs
+        profits[step] = [rewards[agent] for agent in agents]
+        effective_demand[step] = env.effective_demand
+        substitute_pressure[step] = env.substitute_pressure
+        economic_regimes[step] = env.economic_regime
+        n_steps = step + 1
+        
+        if render and step % 20 == 0:
+            env.render()
+        
+        if any(terminations.values()):
+            break
+    
+    cumulative_profits = np.cumsum(profits[:n_steps], axis=0)
+    
+    # Print episode summary
+    print(f"  Final profits: {[f'{profit:.0f}' for profit in cumulative_profits[-1]]}")
+    print()
+    
+    def per_agent(values):
+        return values[:n_steps].ravel()
+    
+    def per_step(values):
+        return np.repeat(values[:n_steps], n_agents)
+    
+    return pd.DataFrame({
+        "episode": np.int32(episode),
+        "step": per_step(np.arange(max_steps, dtype=np.int32)),
+        "agent": pd.Categorical.from_codes(np.tile(np.arange(n_agents), n_steps), categories=agents),
+        "price": per_agent(prices),
+        "rd_investment": per_agent(rd_investments),
+        "innovation_stock": per_agent(innovation_stocks),
+        "market_share": per_agent(market_shares),
+        "marginal_cost": per_agent(marginal_costs),
+        "quantity": per_agent(market_shares * effective_demand[:, None]),
+        "profit_step": per_agent(profits),
+        "cum_profit": cumulative_profits.ravel(),
+        "effective_demand": per_step(effective_demand),
+        # Fixed categories so per-episode logs concatenate as categoricals
+        # even if an episode never leaves one regime
+        "economic_regime": pd.Categorical(per_step(economic_regimes), categories=ECONOMIC_REGIMES),
+        "substitute_pressure": per_step(substitute_pressure),
+    })
+
+
+# Models held by each tournament worker process (loaded once per worker)
+_worker_models = None
+
+
+def _init_worker(model_paths: dict):
+    """
+    Load the models in a worker process.
+    
+    Workers load from the saved files rather than receiving pickled
+    models, so this works under any start method (fork, spawn,
+    forkserver). Torch is limited to one thread per worker so the pool
+    does not oversubscribe the CPUs.
+    """
+    import torch
+    
+    global _worker_models
+    torch.set_num_threads(1)
+    _worker_models = load_model_files(model_paths)
+
+
+def _run_worker_episode(episode: int, n_episodes: int, max_steps: int, render: bool) -> pd.DataFrame:
+    """Run one episode in a worker process with its preloaded models."""
+    return run_episode(_worker_models, episode, n_episodes, max_steps, render)
+
+
 def run_tournament(
     models: dict,
     n_episodes: int = 10,
     max_steps: int = 200,
     output_dir: str = "version1/experiments/logs/evaluation",
     render: bool = False,
+    n_jobs: int = 1,
+    model_paths: dict = None,
 ) -> pd.DataFrame:
     """
     Run tournament and log all market dynamics.
     
+    Episodes are independent, so with n_jobs != 1 they are spread over
+    a process pool (each worker loads the models from model_paths once).
+    
     Args:
-        models: Dict[agent_name -> PPO model]
+        models: Dict[agent_name -> PPO model]; used (and required) only
+            when n_jobs == 1
         n_episodes: Number of independent episodes
         max_steps: Steps per episode
         output_dir: Directory to save CSV logs
         render: Whether to print market state each step
+        n_jobs: Number of worker processes (1 = sequential, -1 = all cores)
+        model_paths: Dict[agent_name -> model file path]; required when
+            n_jobs != 1
     
     Returns:
         logs: DataFrame with all recorded variables
     """
     
+    if n_jobs != 1 and model_paths is None:
+        raise ValueError("model_paths is required when n_jobs != 1")
+    
     os.makedirs(output_dir, exist_ok=True)
     
     print("\n" + "="*70)
@@ -84,76 +281,40 @@ def run_tournament(
     print(f"Output: {output_dir}")
     print("="*70 + "\n")
     
-    logs = []
-    
-    for episode in range(n_episodes):
-        print(f"Episode {episode+1}/{n_episodes}")
-        
-        env = MarketEnvMultiV1(n_firms=3, max_steps=max_steps)
-        observations, _ = env.reset()
-        
-        cumulative_profits = {"firm_0": 0, "firm_1": 0, "firm_2": 0}
-        
-        for step in range(max_steps):
-            # Get actions from trained models
-            actions = {}
-            for agent in models.keys():
-                obs = observations[agent].reshape(1, -1)
-                action, _ = models[agent].predict(obs, deterministic=True)
-                actions[agent] = action[0]
-            
-            # Step environment
-            observations, rewards, terminations, truncations, infos = env.step(actions)
-            
-            # Update cumulative profits
-            for agent in models.keys():
-                cumulative_profits[agent] += rewards[agent]
-            
-            # Log state
-            for i, agent in enumerate(models.keys()):
-                log_entry = {
-                    "episode": episode,
-                    "step": step,
-                    "agent": agent,
-                    "price": float(env.prices[i]),
-                    "rd_investment": float(actions[agent][1]),
-                    "innovation_stock": float(env.innovation_stocks[i]),
-                    "market_share": float(env.market_shares[i]),
-                    "marginal_cost": float(env.marginal_costs[i]),
-                    "quantity": float(env.market_shares[i] * env.effective_demand),
-                    "profit_step": float(rewards[agent]),
-                    "cum_profit": float(cumulative_profits[agent]),
-                    "effective_demand": float(env.effective_demand),
-                    "economic_regime": env.economic_regime,
-                    "substitute_pressure": float(env.substitute_pressure),
-                }
-                logs.append(log_entry)
-            
-            if render and step % 20 == 0:
-                env.render()
-            
-            if any(terminations.values()):
-                break
-        
-        # Print episode summary
-        print(f"  Final profits: {[f'{cumulative_profits[a]:.0f}' for a in models.keys()]}")
-        print()
+    if n_jobs == 1:
+        episode_logs = [
+            run_episode(models, episode, n_episodes, max_steps, render)
+            for episode in range(n_episodes)
+        ]
+    else:
+        max_workers = None if n_jobs < 0 else n_jobs
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(model_paths,),
+        ) as executor:
+            episode_logs = list(executor.map(
+                _run_worker_episode,
+                range(n_episodes),
+                repeat(n_episodes),
+                repeat(max_steps),
+                repeat(render),
+            ))
     
-    # Convert to DataFrame
-    logs_df = pd.DataFrame(logs)
+    logs_df = pd.concat(episode_logs, ignore_index=True)
     
     # ====================================================================
     # AGGREGATE STATISTICS
     # ====================================================================
     
     # Average prices by agent
-    avg_prices = logs_df.groupby("agent")["price"].mean()
+    avg_prices = logs_df.groupby("agent", observed=True, sort=False)["price"].mean()
     print("\nAverage Prices:")
     for agent, price in avg_prices.items():
         print(f"  {agent}: ${price:.2f}")
     
     # Average market shares
-    avg_shares = logs_df.groupby("agent")["market_share"].mean()
+    avg_shares = logs_df.groupby("agent", observed=True, sort=False)["market_share"].mean()
     print("\nAverage Market Shares:")
     for agent, share in avg_shares.items():
         print(f"  {agent}: {share:.1%}")
@@ -164,13 +325,13 @@ def run_tournament(
     print(f"  (1/3 = perfect competition {1/3:.4f}; 1 = monopoly)")
     
     # Average profits per episode
-    avg_profits = logs_df.groupby(["episode", "agent"])["cum_profit"].max().groupby("agent").mean()
+    avg_profits = logs_df.groupby(["episode", "agent"], observed=True, sort=False)["cum_profit"].max().groupby("agent", observed=True, sort=False).mean()
     print("\nAverage Cumulative Profit (per episode):")
     for agent, profit in avg_profits.items():
         print(f"  {agent}: ${profit:,.0f}")
     
     # Innovation levels
-    avg_innovation = logs_df.groupby("agent")["innovation_stock"].max().groupby("agent").mean()
+    avg_innovation = logs_df.groupby("agent", observed=True, sort=False)["innovation_stock"].max().groupby("agent", observed=True, sort=False).mean()
     print("\nAverage Final Innovation Stock:")
     for agent, inno in avg_innovation.items():
         print(f"  {agent}: {inno:.2f}")
@@ -189,6 +350,7 @@ def run_tournament(
 if __name__ == "__main__":
     import sys
     
+    # Usage: eval_tournament.py [model_dir] [n_jobs]
     # Use default model directory if not provided
     if len(sys.argv) < 2:
         model_dir = "version1/experiments/models"
@@ -196,8 +358,12 @@ if __name__ == "__main__":
     else:
         model_dir = sys.argv[1]
     
-    # Load models
-    models = load_models(model_dir)
+    # Worker processes for the episodes (1 = sequential, -1 = all cores)
+    n_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else -1
+    
+    # Load models (parallel workers load their own copies from the paths)
+    model_paths = find_model_paths(model_dir)
+    models = load_model_files(model_paths) if n_jobs == 1 else None
     
     # Run tournament
     logs_df = run_tournament(
@@ -205,6 +371,8 @@ if __name__ == "__main__":
         n_episodes=10,
         max_steps=200,
         render=False,
+        n_jobs=n_jobs,
+        model_paths=model_paths,
     )
     
     print("\n✅ Evaluation complete.")
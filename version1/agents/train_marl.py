@@ -20,7 +20,8 @@ from datetime import datetime
 from stable_baselines3 import PPO
 from gymnasium import Env, spaces
 
-from env.market_env_multi_v1 import MarketEnvMultiV1
+from env.market_env_multi_v1 import BatchedMarketEnv, MarketEnvMultiV1
+from agents.agent_utils import predict_actions
 
 
 # ====================================================================
@@ -41,12 +42,16 @@ def train_self_play(
     clip_range: float = 0.2,
     log_dir: str = "version1/experiments/logs/training",
     model_save_dir: str = "version1/experiments/models",
+    n_envs: int = 8,
+    shared_policy: bool = False,
 ):
     """
     Train 3 PPO agents in self-play on the oligopoly market.
     
-    Uses episodes with manual rollout collection (no vectorization).
-    Each agent is trained independently with PPO.
+    Uses manual rollout collection over batches of n_envs episodes
+    stepped together (BatchedMarketEnv). Each agent is trained
+    independently with PPO, or all firms play one shared policy
+    (shared_policy=True) that is queried once per step for every firm.
     
     Args:
         total_timesteps: Target total environment steps (approximate)
@@ -61,10 +66,15 @@ def train_self_play(
         clip_range: PPO clip range
         log_dir: Directory for metrics logs
         model_save_dir: Directory for model checkpoints
+        n_envs: Episodes stepped together per batch
+        shared_policy: Use a single PPO model for all firms (symmetric self-play)
     
     Returns:
         models: Dict[agent_name -> trained PPO model]
-        env: Final environment instance
+        env: Final BatchedMarketEnv, holding the last batch of (up to
+            n_envs) episodes. This is a batch of markets, not a single
+            MarketEnvMultiV1; use env.market for the single-market
+            parameters and spaces.
     """
     
     # Setup directories
@@ -127,6 +137,12 @@ def train_self_play(
     wrapper_env = SingleAgentWrapper(obs_shape, action_shape)
     
     for agent_name in agent_names:
+        if shared_policy and models:
+            # Symmetric firms: reuse the first firm's model
+            models[agent_name] = models[agent_names[0]]
+            print(f"Initialized {agent_name} (shared policy)")
+            continue
+        
         model = PPO(
             policy,
             wrapper_env,
@@ -151,41 +167,43 @@ def train_self_play(
     
     episode_rewards = {agent: [] for agent in agent_names}
     total_steps = 0
+    log_every = max(1, n_episodes // 10)
+    
+    # Episodes run in lock-step batches of n_envs markets (one seed each)
+    env = BatchedMarketEnv(n_firms=3, max_steps=200)
     
     try:
-        for episode in range(n_episodes):
-            env = MarketEnvMultiV1(n_firms=3, max_steps=200, seed=episode)
-            obs, info = env.reset()
+        for first_episode in range(0, n_episodes, n_envs):
+            seeds = range(first_episode, min(first_episode + n_envs, n_episodes))
+            obs = env.reset(seeds)
             
             done = False
-            ep_rewards = {agent: 0 for agent in agent_names}
-            ep_steps = 0
+            ep_rewards = np.zeros((len(seeds), len(agent_names)))
+            actions = np.empty((len(seeds), len(agent_names), 2), dtype=np.float32)
             
             while not done:
-                # Get actions from trained models
-                actions = {}
-                for agent_name, model in models.items():
-                    obs_array = obs[agent_name].reshape(1, -1)
-                    action, _ = model.predict(obs_array, deterministic=False)
-                    actions[agent_name] = action[0]
+                # Get actions from trained models (one batched predict per
+                # distinct model, over every market and the firms sharing it)
+                agent_actions = predict_actions(
+                    models, dict.fromkeys(agent_names, obs), deterministic=False
+                )
+                for i, agent_name in enumerate(agent_names):
+                    actions[:, i] = agent_actions[agent_name]
                 
                 # Step environment
-                obs, rewards, terminations, truncations, infos = env.step(actions)
+                obs, rewards, done = env.step(actions)
                 
                 # Accumulate rewards
-                for agent in agent_names:
-                    ep_rewards[agent] += rewards[agent]
-                
-                ep_steps += 1
-                total_steps += 1
-                done = any(terminations.values())
+                ep_rewards += rewards
+                total_steps += len(seeds)
             
             # Store episode rewards
-            for agent_name in agent_names:
-                episode_rewards[agent_name].append(ep_rewards[agent_name])
+            for i, agent_name in enumerate(agent_names):
+                episode_rewards[agent_name].extend(ep_rewards[:, i].tolist())
             
-            # Progress logging every 100 episodes
-            if (episode + 1) % max(1, n_episodes // 10) == 0:
+            # Progress logging every 10% of episodes
+            episode = seeds[-1]
+            if (episode + 1) // log_every > first_episode // log_every:
                 pct = 100 * (episode + 1) / n_episodes
                 avg_rewards = {
                     agent: np.mean(episode_rewards[agent][-100:])
@@ -222,41 +240,36 @@ def evaluate_agents(models: dict, n_eval_episodes: int = 5) -> dict:
         results: Dict with average rewards, prices, quantities
     """
     
-    rewards_by_agent = {agent: [] for agent in models.keys()}
-    prices_all = []
+    agents = list(models.keys())
+    max_steps = 200
+    
+    # Preallocated buffers: episode rewards (episode x agent) and the
+    # price vector of every evaluated step
+    episode_rewards = np.zeros((n_eval_episodes, len(agents)))
+    prices_all = np.empty((n_eval_episodes * max_steps, 3), dtype=np.float32)
+    n_logged = 0
+    
+    # One environment for all episodes; reset() starts each new episode
+    env = MarketEnvMultiV1(n_firms=3, max_steps=max_steps)
     
     for episode in range(n_eval_episodes):
-        env = MarketEnvMultiV1(n_firms=3, max_steps=200)
         observations, _ = env.reset()
         episode_done = False
-        ep_rewards = {agent: 0 for agent in models.keys()}
         
         while not episode_done:
-            actions = {}
-            for agent in models.keys():
-                obs = observations[agent].reshape(1, -1)
-                action, _ = models[agent].predict(obs, deterministic=True)
-                actions[agent] = action[0]
+            actions = predict_actions(models, observations, deterministic=True)
             
             observations, rewards, terminations, truncations, _ = env.step(actions)
             
-            for agent in models.keys():
-                ep_rewards[agent] += rewards[agent]
+            episode_rewards[episode] += [rewards[agent] for agent in agents]
             
-            prices_all.append(env.prices.copy())
+            prices_all[n_logged] = env.prices
+            n_logged += 1
             episode_done = any(terminations.values())
-        
-        for agent in models.keys():
-            rewards_by_agent[agent].append(ep_rewards[agent])
     
     # Aggregate results
-    avg_rewards = {
-        agent: np.mean(rewards_by_agent[agent])
-        for agent in models.keys()
-    }
-    
-    prices_array = np.array(prices_all)
-    avg_prices = np.mean(prices_array)
+    avg_rewards = dict(zip(agents, episode_rewards.mean(axis=0)))
+    avg_prices = np.mean(prices_all[:n_logged])
     
     return {
         "avg_rewards": avg_rewards,
@@ -266,7 +279,7 @@ def evaluate_agents(models: dict, n_eval_episodes: int = 5) -> dict:
 
 if __name__ == "__main__":
     # Train agents
-    models, envs = train_self_play(
+    models, batched_env = train_self_play(
         total_timesteps=300000,
         n_envs=4,
         learning_rate=3e-4,
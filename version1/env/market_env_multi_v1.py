@@ -8,11 +8,231 @@ Economics: Manufacturing/Pharmaceutical oligopoly with 3 firms competing
 on price and R&D investment under regulatory constraints and market shocks.
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 from pettingzoo import ParallelEnv
 from gymnasium import spaces
 from typing import Dict, Tuple
 
+# Add project root to path for imports (the env is also imported as `env.*`
+# with only version1/ on the path)
+project_root = str(Path(__file__).resolve().parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+# Numba's njit, or a no-op stand-in when Numba is not installed
+from core.models._kernels import HAS_NUMBA, njit
+
+
+# Regime names indexed by the integer regime state (1 = boom, as observed)
+ECONOMIC_REGIMES = ("recession", "boom")
+
+
+# Kernels work on a batch of markets: per-firm arrays are (n_envs, n_firms)
+# and per-market arrays (n_envs,). MarketEnvMultiV1 passes a batch of one
+# market, BatchedMarketEnv its whole batch, so both share the economics.
+# No on-disk cache: the env is imported both as `env.*` and `version1.env.*`,
+# and Numba's cache records the importing module name
+@njit
+def clip_actions_kernel(actions, marginal_costs, min_margin, max_price, prices, rd_investments):
+    """
+    Enforce the action constraints for one market period.
+    
+    Writes prices clipped to [marginal_cost + min_margin, max_price] and
+    non-negative R&D spend into `prices` and `rd_investments`, without the
+    per-call NumPy dispatch that dominates at n_firms=3.
+    
+    Args:
+        actions: Array of shape (n_envs, n_firms, 2) with [price, R&D] rows
+        marginal_costs: Current marginal costs, (n_envs, n_firms)
+        prices: Output prices (float32), (n_envs, n_firms)
+        rd_investments: Output R&D spend (float32), (n_envs, n_firms)
+    """
+    margin = np.float32(min_margin)
+    upper = np.float32(max_price)
+    
+    for b in range(actions.shape[0]):
+        for i in range(actions.shape[1]):
+            lower = marginal_costs[b, i] + margin
+            price = actions[b, i, 0]
+            price = lower if price < lower else price
+            prices[b, i] = upper if price > upper else price
+            
+            rd = actions[b, i, 1]
+            rd_investments[b, i] = 0.0 if rd < 0.0 else rd
+
+
+@njit
+def market_step_kernel(
+    prices,
+    innovation_stocks,
+    rd_investments,
+    cycle_mult,
+    supplier_shock,
+    substitute_pressure,
+    timestep,
+    params,
+    marginal_costs,
+    market_shares,
+    effective_demand,
+    avg_price,
+):
+    """
+    Demand, market-share allocation and per-firm profit for one market period.
+    
+    Pure function of the period's state and shocks, so it can be compiled
+    with Numba (when installed). State outputs (marginal_costs,
+    market_shares, effective_demand, avg_price) are written in place.
+    
+    Args:
+        prices, innovation_stocks, rd_investments: Firm state, (n_envs, n_firms)
+        cycle_mult, supplier_shock, substitute_pressure: Shocks, (n_envs,)
+        timestep: Current period (shared by all markets)
+        params: Economic constants, see MarketEnvMultiV1._kernel_params
+    
+    Returns:
+        profits: Profit per firm (reward signal, float64), (n_envs, n_firms).
+            Computed in float64 because rewards are summed over episodes.
+    """
+    (D0, price_elasticity, alpha, beta0, beta_tech_progress, beta_diminishing,
+     C_base, k_rd, c_capital, c_compliance_fixed, c_compliance_var) = params
+    
+    n_envs, n_firms = prices.shape
+    profits = np.empty((n_envs, n_firms))
+    
+    for b in range(n_envs):
+        total_price = 0.0
+        total_innovation = 0.0
+        for i in range(n_firms):
+            total_price += prices[b, i]
+            total_innovation += innovation_stocks[b, i]
+        
+        # Demand: economic cycle, price elasticity (buyer power) and
+        # substitute pressure
+        avg_price[b] = total_price / n_firms
+        effective_demand[b] = (
+            D0 * cycle_mult[b]
+            * np.exp(-price_elasticity * avg_price[b])
+            * (1.0 - substitute_pressure[b])
+        )
+        
+        # Innovation effectiveness (time-varying with diminishing returns)
+        beta = beta0 * (1.0 + beta_tech_progress * timestep)
+        if total_innovation > 0:
+            beta *= 1.0 / (1.0 + beta_diminishing * total_innovation)
+        
+        # Softmax: S_i = exp(-α·P_i + β·I_i) / Σ exp(...); the profit row
+        # holds the utilities until the profits are written
+        utility = profits[b]
+        max_utility = -alpha * prices[b, 0] + beta * innovation_stocks[b, 0]
+        for i in range(n_firms):
+            utility[i] = -alpha * prices[b, i] + beta * innovation_stocks[b, i]
+            if utility[i] > max_utility:
+                max_utility = utility[i]
+        
+        total_exp = 0.0
+        for i in range(n_firms):
+            utility[i] = np.exp(utility[i] - max_utility)  # Numerical stability
+            total_exp += utility[i]
+        
+        # Marginal costs (with supplier shock) and
+        # profit = revenue - (marginal + R&D + capital + compliance costs)
+        marginal_cost = C_base * supplier_shock[b]
+        for i in range(n_firms):
+            share = utility[i] / total_exp
+            market_shares[b, i] = share
+            marginal_costs[b, i] = marginal_cost
+            
+            quantity = share * effective_demand[b]
+            rd = np.float64(rd_investments[b, i])
+            profits[b, i] = prices[b, i] * quantity - (
+                marginal_costs[b, i] * quantity
+                + k_rd * rd * rd
+                + c_capital
+                + (c_compliance_fixed + c_compliance_var * quantity)
+            )
+    
+    return profits
+
+
+def clip_actions_kernel_numpy(actions, marginal_costs, min_margin, max_price, prices, rd_investments):
+    """Vectorized NumPy version of ``clip_actions_kernel`` (no Numba)."""
+    lower = marginal_costs + np.float32(min_margin)
+    np.maximum(actions[..., 0], lower, out=prices)
+    np.minimum(prices, np.float32(max_price), out=prices)
+    np.maximum(actions[..., 1], 0.0, out=rd_investments)
+
+
+def market_step_kernel_numpy(
+    prices,
+    innovation_stocks,
+    rd_investments,
+    cycle_mult,
+    supplier_shock,
+    substitute_pressure,
+    timestep,
+    params,
+    marginal_costs,
+    market_shares,
+    effective_demand,
+    avg_price,
+):
+    """
+    Vectorized NumPy version of ``market_step_kernel`` (no Numba).
+    
+    Same math and dtypes as the compiled loops: float32 state is widened
+    to float64 before use, and the float32 marginal costs are read back
+    after they are written.
+    """
+    (D0, price_elasticity, alpha, beta0, beta_tech_progress, beta_diminishing,
+     C_base, k_rd, c_capital, c_compliance_fixed, c_compliance_var) = params
+    
+    prices = prices.astype(np.float64)
+    innovation = innovation_stocks.astype(np.float64)
+    
+    avg_price[:] = prices.sum(axis=1) / prices.shape[1]
+    effective_demand[:] = (
+        D0 * cycle_mult
+        * np.exp(-price_elasticity * avg_price)
+        * (1.0 - substitute_pressure)
+    )
+    
+    total_innovation = innovation.sum(axis=1)
+    beta = np.full(len(prices), beta0 * (1.0 + beta_tech_progress * timestep))
+    has_innovation = total_innovation > 0
+    beta[has_innovation] *= 1.0 / (1.0 + beta_diminishing * total_innovation[has_innovation])
+    
+    utility = -alpha * prices + beta[:, None] * innovation
+    exp_utility = np.exp(utility - utility.max(axis=1, keepdims=True))
+    shares = exp_utility / exp_utility.sum(axis=1, keepdims=True)
+    market_shares[:] = shares
+    marginal_costs[:] = (C_base * supplier_shock)[:, None]
+    
+    quantity = shares * effective_demand[:, None]
+    rd = rd_investments.astype(np.float64)
+    return prices * quantity - (
+        marginal_costs.astype(np.float64) * quantity
+        + k_rd * rd * rd
+        + c_capital
+        + (c_compliance_fixed + c_compliance_var * quantity)
+    )
+
+
+def select_kernels(n_envs: int) -> Tuple:
+    """
+    Pick the (clip_actions, market_step) kernels for a batch of markets.
+    
+    The compiled loops with Numba. Without it, the interpreted loops for a
+    single market (cheaper than NumPy dispatch at a few firms) and the
+    vectorized NumPy versions for larger batches, whose per-firm Python
+    loops would otherwise scale with n_envs.
+    """
+    if HAS_NUMBA or n_envs == 1:
+        return clip_actions_kernel, market_step_kernel
+    return clip_actions_kernel_numpy, market_step_kernel_numpy
+
 
 class MarketEnvMultiV1(ParallelEnv):
     """
@@ -53,11 +273,13 @@ class MarketEnvMultiV1(ParallelEnv):
         self.D0 = 1000.0  # Base market size (units)
         self.price_elasticity = 0.015  # Buyer power (ε)
         
-        # Cost structure
-        self.C_base = 80.0  # Base marginal cost ($/unit)
+        # Cost structure. C_base (like the price bounds below) is float32
+        # because it sets float32 state; the other constants stay float64,
+        # as the kernel's demand and profit math is
+        self.C_base = np.float32(80.0)  # Base marginal cost ($/unit)
         self.C_capital = 30.0  # Fixed capital cost (reduced - was 150)
         self.C_compliance_fixed = 10.0  # Fixed compliance cost (reduced - was 50)
-        self.C_compliance_var = 0.02 * self.C_base  # Variable compliance ($/unit)
+        self.C_compliance_var = 0.02 * float(self.C_base)  # Variable compliance ($/unit)
         self.k_rd = 0.05  # R&D cost coefficient (quadratic)
         
         # Market competition
@@ -67,13 +289,18 @@ class MarketEnvMultiV1(ParallelEnv):
         self.beta_diminishing = 0.01  # Diminishing returns on innovation
         
         # Regulation
-        self.P_max = 250.0  # Price ceiling
-        self.P_min_margin = 1.0  # Minimum profit margin above cost
+        self.P_max = np.float32(250.0)  # Price ceiling
+        self.P_min_margin = np.float32(1.0)  # Minimum profit margin above cost
         
         # Exogenous dynamics
         self.boom_multiplier = 1.2
         self.recession_multiplier = 0.8
         self.regime_noise_std = 0.02
+        self._cycle_mults = (self.recession_multiplier, self.boom_multiplier)  # By regime
+        
+        # Markov switching probability out of each regime:
+        # recession -> boom 0.10, boom -> recession 0.05
+        self._switch_probs = (0.10, 0.05)
         
         # Supplier shock
         self.supplier_shock_std = 0.05
@@ -83,6 +310,16 @@ class MarketEnvMultiV1(ParallelEnv):
         self.substitute_pressure_max = 0.3
         self.substitute_pressure_drift = 0.005
         
+        # Shocks are drawn for this many periods at a time (see _draw_shocks)
+        self._shock_block = min(max_steps, 1000)
+        
+        # Constants consumed by market_step_kernel (shared with BatchedMarketEnv)
+        self._kernel_params = (
+            self.D0, self.price_elasticity, self.alpha, self.beta0,
+            self.beta_tech_progress, self.beta_diminishing, float(self.C_base),
+            self.k_rd, self.C_capital, self.C_compliance_fixed, self.C_compliance_var,
+        )
+        
         # ================================================================
         # AGENT SETUP
         # ================================================================
@@ -123,6 +360,7 @@ class MarketEnvMultiV1(ParallelEnv):
         # Market state
         self.timestep = 0
         self.prices = np.zeros(n_firms, dtype=np.float32)
+        self._avg_price = 0.0
         self.innovation_stocks = np.zeros(n_firms, dtype=np.float32)
         self.market_shares = np.ones(n_firms, dtype=np.float32) / n_firms
         self.marginal_costs = np.ones(n_firms, dtype=np.float32) * self.C_base
@@ -132,9 +370,28 @@ class MarketEnvMultiV1(ParallelEnv):
         self.effective_demand = self.D0
         
         # Exogenous shocks
-        self.economic_regime = "boom"  # "boom" or "recession"
+        self._regime = 1  # Index into ECONOMIC_REGIMES (1 = boom)
         self.supplier_shock = 1.0
         self.substitute_pressure = 0.15
+        self._shock_rows = None  # Current block of shock draws, as row lists
+        self._shock_pos = self._shock_block  # Next row; a full block is redrawn
+        
+        # Observation and action scratch buffers, filled in place every step
+        self._obs_buf = np.empty(4 * n_firms + 5, dtype=np.float32)
+        self._action_buf = np.empty((n_firms, 2), dtype=np.float32)
+        
+        # Batch-of-one views and buffers for the shared kernels. The state
+        # arrays above are only ever updated in place, so the views stay valid
+        self._market_views = (
+            self.prices[None],
+            self.innovation_stocks[None],
+            self.market_shares[None],
+            self.marginal_costs[None],
+        )
+        self._rd_buf = np.empty((1, n_firms), dtype=np.float32)
+        self._shock_bufs = (np.empty(1), np.empty(1), np.empty(1))  # cycle, supplier, substitute
+        self._demand_bufs = (np.empty(1), np.empty(1))  # effective demand, avg price
+        self._clip_actions, self._market_step = select_kernels(1)
         
         # ================================================================
         # RESET MUST BE CALLED BEFORE FIRST STEP
@@ -147,7 +404,29 @@ class MarketEnvMultiV1(ParallelEnv):
     def action_space(self, agent: str) -> spaces.Box:
         """Return action space for agent."""
         return self._action_spaces[agent]
-    
+
+    def sample_actions(self, n_steps: int, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Draw uniform random actions for all firms and steps in one call.
+
+        Replaces per-step, per-agent `action_space(agent).sample()` calls
+        in random-policy rollouts.
+
+        Args:
+            n_steps: Number of steps to sample
+            rng: Optional NumPy Generator (defaults to a fresh one)
+
+        Returns:
+            actions: Array of shape (n_steps, n_firms, 2) with [price, R&D] rows
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        low = np.stack([self._action_spaces[agent].low for agent in self.agents])
+        high = np.stack([self._action_spaces[agent].high for agent in self.agents])
+
+        return rng.uniform(low, high, size=(n_steps,) + low.shape).astype(np.float32)
+
     # ====================================================================
     # ENVIRONMENT LIFECYCLE
     # ====================================================================
@@ -168,27 +447,28 @@ class MarketEnvMultiV1(ParallelEnv):
         # Initialize prices uniformly in feasible range
         price_min = self.C_base + self.P_min_margin
         price_max = self.P_max
-        self.prices = self._rng.uniform(
-            price_min, price_max, self.n_firms
-        ).astype(np.float32)
+        self.prices[:] = self._rng.uniform(price_min, price_max, self.n_firms)
+        self._avg_price = np.mean(self.prices)
         
-        # Initialize innovation at zero
-        self.innovation_stocks = np.zeros(self.n_firms, dtype=np.float32)
+        # Initialize innovation at zero (state arrays are reset in place)
+        self.innovation_stocks.fill(0.0)
         
         # Initialize equal market shares
-        self.market_shares = np.ones(self.n_firms, dtype=np.float32) / self.n_firms
+        self.market_shares.fill(1.0 / self.n_firms)
         
         # Initialize marginal costs
-        self.marginal_costs = np.ones(self.n_firms, dtype=np.float32) * self.C_base
+        self.marginal_costs.fill(self.C_base)
         
         # Initialize demand
         self.total_demand = self.D0
         self.effective_demand = self.D0
         
         # Initialize exogenous shocks
-        self.economic_regime = self._rng.choice(["boom", "recession"])
+        # Same draw as choice(["boom", "recession"]): 0 -> boom
+        self._regime = 1 - self._rng.randint(2)
         self.supplier_shock = self._rng.lognormal(0, self.supplier_shock_std)
         self.substitute_pressure = 0.15
+        self._shock_pos = self._shock_block  # Draw a fresh block on the first step
         
         observations = self._get_observations()
         infos = {agent: {} for agent in self.agents}
@@ -209,156 +489,171 @@ class MarketEnvMultiV1(ParallelEnv):
             truncations: Dict[agent -> False]
             infos: Dict[agent -> {}]
         """
+        action_arr = self._action_buf
+        for i, agent in enumerate(self.agents):
+            action_arr[i] = actions[agent]
+        profits, done, truncated, _ = self.step_array(action_arr)
+        
+        rewards = dict(zip(self.agents, profits.tolist()))
+        observations = self._get_observations()
+        terminations = dict.fromkeys(self.agents, done)
+        truncations = dict.fromkeys(self.agents, truncated)
+        infos = {agent: {} for agent in self.agents}
+        
+        return observations, rewards, terminations, truncations, infos
+    
+    def step_array(self, action_arr: np.ndarray) -> Tuple[np.ndarray, bool, bool, dict]:
+        """
+        Execute one market period with array actions and rewards.
+        
+        Array-native counterpart of `step()`: skips the per-agent dicts and
+        observation construction (use `_get_observations()` if needed).
+        
+        Args:
+            action_arr: Array of shape (n_firms, 2) with [price, R&D] rows,
+                in `self.agents` order
+        
+        Returns:
+            rewards: Array of shape (n_firms,) with per-firm profit
+            terminated: True once max_steps is reached
+            truncated: Always False
+            info: Empty dict
+        """
         self.timestep += 1
         
         # ================================================================
         # 1. UPDATE STATE FROM ACTIONS
         # ================================================================
         
-        # Extract and clip prices and R&D
-        prices = np.array(
-            [actions[agent][0] for agent in self.agents],
-            dtype=np.float32
-        )
-        rd_investments = np.array(
-            [actions[agent][1] for agent in self.agents],
-            dtype=np.float32
-        )
-        
-        # Hard constraint: enforce price bounds
-        prices = np.clip(
+        # Clip prices to [C_m + margin, P_max] (hard constraint) and R&D to
+        # non-negative, writing the prices into the state in place
+        prices, innovation_stocks, market_shares, marginal_costs = self._market_views
+        rd_investments = self._rd_buf
+        action_arr = np.asarray(action_arr, dtype=np.float32)
+        self._clip_actions(
+            action_arr[None],
+            marginal_costs,
+            self.P_min_margin,
+            self.P_max,
             prices,
-            self.marginal_costs + self.P_min_margin,
-            self.P_max
+            rd_investments
         )
         
-        # Clip R&D to non-negative
-        rd_investments = np.maximum(rd_investments, 0.0)
-        
-        self.prices = prices
-        
         # Update innovation stocks (accumulate R&D)
-        self.innovation_stocks += rd_investments
+        self.innovation_stocks += rd_investments[0]
         
         # ================================================================
         # 2. EXOGENOUS SHOCKS (Markov regime + stochastic)
         # ================================================================
         
-        # Economic cycle (Markov switching + noise)
-        if self.economic_regime == "boom":
-            # Boom -> Boom with prob 0.95, Boom -> Recession with prob 0.05
-            if self._rng.rand() < 0.05:
-                self.economic_regime = "recession"
-        else:  # recession
-            # Recession -> Recession with prob 0.90, Recession -> Boom with prob 0.10
-            if self._rng.rand() < 0.10:
-                self.economic_regime = "boom"
+        if self._shock_pos == self._shock_block:
+            self._shock_rows = self._draw_shocks(self._rng).tolist()
+            self._shock_pos = 0
+        switch_draw, cycle_noise, self.supplier_shock, pressure_step = self._shock_rows[self._shock_pos]
+        self._shock_pos += 1
         
-        # Economic cycle multiplier with noise
-        cycle_mult = (
-            self.boom_multiplier if self.economic_regime == "boom"
-            else self.recession_multiplier
-        )
-        cycle_mult *= self._rng.normal(1.0, self.regime_noise_std)
+        # Economic cycle (Markov switching + noise): flip the regime
+        # with the current regime's switching probability
+        self._regime ^= switch_draw < self._switch_probs[self._regime]
         
-        # Supplier shock (lognormal)
-        self.supplier_shock = self._rng.lognormal(0, self.supplier_shock_std)
+        # Economic cycle multiplier with noise
+        cycle_mult = self._cycle_mults[self._regime] * cycle_noise
+        self.total_demand = self.D0 * cycle_mult
         
         # Substitute pressure (random walk)
-        self.substitute_pressure += self._rng.normal(0, self.substitute_pressure_drift)
-        self.substitute_pressure = np.clip(
-            self.substitute_pressure,
-            self.substitute_pressure_min,
+        self.substitute_pressure = min(
+            max(self.substitute_pressure + pressure_step, self.substitute_pressure_min),
             self.substitute_pressure_max
         )
         
         # ================================================================
-        # 3. DEMAND CALCULATION
-        # ================================================================
-        
-        # Base demand with economic cycle
-        demand_base = self.D0 * cycle_mult
-        
-        # Average price (for elasticity calculation)
-        avg_price = np.mean(self.prices)
-        
-        # Price elasticity effect (buyer power)
-        elasticity_effect = np.exp(-self.price_elasticity * avg_price)
-        
-        # Substitute pressure effect
-        substitute_effect = 1.0 - self.substitute_pressure
-        
-        # Effective demand
-        self.total_demand = demand_base
-        self.effective_demand = demand_base * elasticity_effect * substitute_effect
-        
-        # ================================================================
-        # 4. MARKET SHARE ALLOCATION (Softmax competition)
-        # ================================================================
-        
-        # Innovation effectiveness (time-varying with diminishing returns)
-        total_innovation = np.sum(self.innovation_stocks)
-        beta = self.beta0 * (1.0 + self.beta_tech_progress * self.timestep)
-        if total_innovation > 0:
-            beta *= 1.0 / (1.0 + self.beta_diminishing * total_innovation)
-        
-        # Softmax: S_i = exp(-α·P_i + β·I_i) / Σ exp(...)
-        utility = -self.alpha * self.prices + beta * self.innovation_stocks
-        utility = utility - np.max(utility)  # Numerical stability
-        
-        exp_utility = np.exp(utility)
-        self.market_shares = exp_utility / np.sum(exp_utility)
-        
-        # ================================================================
-        # 5. QUANTITY & REVENUE
+        # 3-6. DEMAND, SHARES, COSTS & PROFIT (Reward) - see market_step_kernel
         # ================================================================
         
-        quantities = self.market_shares * self.effective_demand
-        
-        # Update marginal costs (with supplier shock)
-        self.marginal_costs = (
-            self.C_base * self.supplier_shock * np.ones(self.n_firms)
-        ).astype(np.float32)
+        cycle_buf, supplier_buf, pressure_buf = self._shock_bufs
+        cycle_buf[0] = cycle_mult
+        supplier_buf[0] = self.supplier_shock
+        pressure_buf[0] = self.substitute_pressure
+        demand_buf, avg_price_buf = self._demand_bufs
         
-        # ================================================================
-        # 6. PROFIT CALCULATION (Reward)
-        # ================================================================
-        
-        rewards = {}
-        for i, agent in enumerate(self.agents):
-            # Revenue
-            revenue = self.prices[i] * quantities[i]
-            
-            # Costs
-            cost_marginal = self.marginal_costs[i] * quantities[i]
-            cost_rd = self.k_rd * (rd_investments[i] ** 2)
-            cost_capital = self.C_capital
-            cost_compliance = self.C_compliance_fixed + self.C_compliance_var * quantities[i]
-            
-            total_cost = cost_marginal + cost_rd + cost_capital + cost_compliance
-            
-            # Profit (reward signal)
-            profit = revenue - total_cost
-            rewards[agent] = float(profit)
+        profits = self._market_step(
+            prices,
+            innovation_stocks,
+            rd_investments,
+            cycle_buf,
+            supplier_buf,
+            pressure_buf,
+            self.timestep,
+            self._kernel_params,
+            marginal_costs,
+            market_shares,
+            demand_buf,
+            avg_price_buf,
+        )
+        self.effective_demand = demand_buf[0]
+        self._avg_price = avg_price_buf[0]
         
         # ================================================================
-        # 7. TERMINATION & OBSERVATIONS
+        # 7. TERMINATION
         # ================================================================
         
-        observations = self._get_observations()
-        
         # Episode terminates after max_steps
         done = self.timestep >= self.max_steps
-        terminations = {agent: done for agent in self.agents}
-        truncations = {agent: False for agent in self.agents}
-        infos = {agent: {} for agent in self.agents}
         
-        return observations, rewards, terminations, truncations, infos
-    
+        return profits[0], done, False, {}
+
+    def _draw_shocks(self, rng: np.random.RandomState) -> np.ndarray:
+        """
+        Draw the exogenous shocks for the next block of periods.
+        
+        One vectorized draw per shock type instead of four scalar draws per
+        step. Both envs consume a market's RandomState in the same blocks,
+        so a seed gives the same episode in either.
+        
+        Returns:
+            shocks: Array of shape (self._shock_block, 4), one row per period:
+                [regime-switch uniform, cycle-multiplier noise,
+                lognormal supplier cost shock, substitute-pressure step]
+        """
+        n = self._shock_block
+        return np.column_stack((
+            rng.rand(n),
+            rng.normal(1.0, self.regime_noise_std, n),
+            rng.lognormal(0, self.supplier_shock_std, n),
+            rng.normal(0, self.substitute_pressure_drift, n),
+        ))
+
+    def rollout(self, actions: np.ndarray) -> np.ndarray:
+        """
+        Advance the environment through a precomputed action sequence.
+
+        Stops early if the episode terminates.
+
+        Args:
+            actions: Array of shape (n_steps, n_firms, 2), e.g. from sample_actions()
+
+        Returns:
+            rewards: Array of shape (steps_taken, n_firms) with per-step profits
+        """
+        rewards = np.empty(actions.shape[:2], dtype=np.float64)
+
+        for t, step_actions in enumerate(actions):
+            rewards[t], done, _, _ = self.step_array(step_actions)
+
+            if done:
+                return rewards[:t + 1]
+
+        return rewards
+
     # ====================================================================
     # HELPERS
     # ====================================================================
     
+    @property
+    def economic_regime(self) -> str:
+        """Current economic regime, "boom" or "recession"."""
+        return ECONOMIC_REGIMES[self._regime]
+    
     def _get_observations(self) -> Dict[str, np.ndarray]:
         """
         Construct full-state observations for all agents.
@@ -366,22 +661,23 @@ class MarketEnvMultiV1(ParallelEnv):
         State = [prices, innovation_stocks, market_shares,
                  marginal_costs, avg_price, effective_demand, timestep, regime_int, substitute_pressure]
         """
-        regime_int = 1.0 if self.economic_regime == "boom" else 0.0
-        
-        obs_vector = np.concatenate([
-            self.prices,
-            self.innovation_stocks,
-            self.market_shares,
-            self.marginal_costs,
-            [np.mean(self.prices)],  # Average price
-            [self.effective_demand],
-            [float(self.timestep)],
-            [regime_int],
-            [self.substitute_pressure],
-        ]).astype(np.float32)
-        
-        # All agents see the same state (full observability)
-        return {agent: obs_vector.copy() for agent in self.agents}
+        n = self.n_firms
+        obs_vector = self._obs_buf
+        obs_vector[:n] = self.prices
+        obs_vector[n:2 * n] = self.innovation_stocks
+        obs_vector[2 * n:3 * n] = self.market_shares
+        obs_vector[3 * n:4 * n] = self.marginal_costs
+        obs_vector[4 * n] = self._avg_price
+        obs_vector[4 * n + 1] = self.effective_demand
+        obs_vector[4 * n + 2] = self.timestep
+        obs_vector[4 * n + 3] = self._regime
+        obs_vector[4 * n + 4] = self.substitute_pressure
+        
+        # All agents see the same state (full observability): one read-only
+        # snapshot shared by every agent instead of a copy per agent
+        obs = obs_vector.copy()
+        obs.setflags(write=False)
+        return {agent: obs for agent in self.agents}
     
     def render(self):
         """Print market state."""
@@ -395,3 +691,154 @@ class MarketEnvMultiV1(ParallelEnv):
                 f"C_m=${self.marginal_costs[i]:.2f}"
             )
         print(f"Demand: {self.total_demand:.0f} | Substitutes: {self.substitute_pressure:.1%}")
+
+
+class BatchedMarketEnv:
+    """
+    Lock-step batch of independent MarketEnvMultiV1 markets.
+    
+    State is held as (n_envs, n_firms) arrays and every market is advanced
+    by the same kernels and shock draws as MarketEnvMultiV1, so policies
+    can be queried once per step for the whole batch. Each market keeps
+    its own RandomState (seeded like `MarketEnvMultiV1(seed=...)`), so a
+    batch reproduces the sequential episodes exactly.
+    
+    All markets share max_steps and terminate together.
+    """
+    
+    def __init__(self, n_firms: int = 3, max_steps: int = 200):
+        """
+        Args:
+            n_firms: Number of competing firms (fixed)
+            max_steps: Episode length (steps = quarters)
+        """
+        # Economic parameters and spaces come from a single-market instance
+        self.market = MarketEnvMultiV1(n_firms=n_firms, max_steps=max_steps)
+        self.n_firms = n_firms
+        self.max_steps = max_steps
+        self.agents = self.market.agents
+        self.n_envs = 0
+    
+    def action_space(self, agent: str) -> spaces.Box:
+        """Return action space for agent."""
+        return self.market.action_space(agent)
+    
+    def observation_space(self, agent: str) -> spaces.Box:
+        """Return observation space for agent."""
+        return self.market.observation_space(agent)
+    
+    def reset(self, seeds) -> np.ndarray:
+        """
+        Start one episode per seed.
+        
+        Args:
+            seeds: Sequence of seeds, one per market (sets n_envs)
+        
+        Returns:
+            observations: Array of shape (n_envs, obs_dim), shared by all agents
+        """
+        m = self.market
+        self._rngs = [np.random.RandomState(seed) for seed in seeds]
+        n_envs = self.n_envs = len(self._rngs)
+        
+        self.timestep = 0
+        self.prices = np.empty((n_envs, self.n_firms), dtype=np.float32)
+        self.regime = np.empty(n_envs, dtype=np.int64)  # Index into ECONOMIC_REGIMES
+        self.supplier_shock = np.empty(n_envs)
+        
+        # Same draw order as MarketEnvMultiV1.reset
+        for b, rng in enumerate(self._rngs):
+            self.prices[b] = rng.uniform(m.C_base + m.P_min_margin, m.P_max, self.n_firms)
+            self.regime[b] = 1 - rng.randint(2)
+            self.supplier_shock[b] = rng.lognormal(0, m.supplier_shock_std)
+        
+        self.innovation_stocks = np.zeros((n_envs, self.n_firms), dtype=np.float32)
+        self.market_shares = np.full((n_envs, self.n_firms), 1.0 / self.n_firms, dtype=np.float32)
+        self.marginal_costs = np.full((n_envs, self.n_firms), m.C_base, dtype=np.float32)
+        self.avg_price = self.prices.mean(axis=1).astype(np.float64)
+        self.effective_demand = np.full(n_envs, m.D0)
+        self.substitute_pressure = np.full(n_envs, 0.15)
+        self._rd_investments = np.empty((n_envs, self.n_firms), dtype=np.float32)
+        self._clip_actions, self._market_step = select_kernels(n_envs)
+        self._shock_pos = m._shock_block  # Draw a fresh block on the first step
+        
+        return self._get_observations()
+    
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """
+        Execute one market period in every market.
+        
+        Args:
+            actions: Array of shape (n_envs, n_firms, 2) with [price, R&D] rows
+        
+        Returns:
+            observations: Array of shape (n_envs, obs_dim)
+            rewards: Array of shape (n_envs, n_firms) with per-firm profit
+            terminated: True once max_steps is reached (all markets at once)
+        """
+        m = self.market
+        self.timestep += 1
+        
+        # Actions: the single-market clipping over the whole batch
+        actions = np.asarray(actions, dtype=np.float32)
+        self._clip_actions(
+            actions,
+            self.marginal_costs,
+            m.P_min_margin,
+            m.P_max,
+            self.prices,
+            self._rd_investments
+        )
+        self.innovation_stocks += self._rd_investments
+        
+        # Exogenous shocks: each market's RandomState draws a block of
+        # periods at a time, like the single market, stacked as
+        # (block, 4, n_envs); applied with the single market's regime tables
+        if self._shock_pos == m._shock_block:
+            self._shocks = np.stack([m._draw_shocks(rng) for rng in self._rngs], axis=-1)
+            self._shock_pos = 0
+        switch_draw, cycle_noise, self.supplier_shock, pressure_step = self._shocks[self._shock_pos]
+        self._shock_pos += 1
+        
+        self.regime ^= switch_draw < np.take(m._switch_probs, self.regime)
+        cycle_mult = np.take(m._cycle_mults, self.regime) * cycle_noise
+        self.substitute_pressure = np.clip(
+            self.substitute_pressure + pressure_step,
+            m.substitute_pressure_min,
+            m.substitute_pressure_max
+        )
+        
+        # Demand, shares, costs & profit (same math as the single market)
+        profits = self._market_step(
+            self.prices,
+            self.innovation_stocks,
+            self._rd_investments,
+            cycle_mult,
+            self.supplier_shock,
+            self.substitute_pressure,
+            self.timestep,
+            m._kernel_params,
+            self.marginal_costs,
+            self.market_shares,
+            self.effective_demand,
+            self.avg_price,
+        )
+        
+        done = self.timestep >= self.max_steps
+        
+        return self._get_observations(), profits, done
+    
+    def _get_observations(self) -> np.ndarray:
+        """Full-state observation per market, in MarketEnvMultiV1 layout."""
+        n = self.n_firms
+        obs = np.empty((self.n_envs, 4 * n + 5), dtype=np.float32)
+        obs[:, :n] = self.prices
+        obs[:, n:2 * n] = self.innovation_stocks
+        obs[:, 2 * n:3 * n] = self.market_shares
+        obs[:, 3 * n:4 * n] = self.marginal_costs
+        obs[:, 4 * n] = self.avg_price
+        obs[:, 4 * n + 1] = self.effective_demand
+        obs[:, 4 * n + 2] = self.timestep
+        obs[:, 4 * n + 3] = self.regime
+        obs[:, 4 * n + 4] = self.substitute_pressure
+        return obs
@@ -0,0 +1,79 @@
+"""
+Unit Tests for the agent helpers
+
+Validates:
+- predict_actions grouping (one predict call per distinct model)
+- Per-agent action order, for single and batched observations
+"""
+
+import pytest
+import numpy as np
+from version1.agents.agent_utils import predict_actions
+
+
+class StubModel:
+    """Policy stub whose action echoes the first two observation entries."""
+
+    def __init__(self, offset=0.0):
+        self.offset = offset
+        self.batch_shapes = []
+
+    def predict(self, obs, deterministic=True):
+        self.batch_shapes.append(obs.shape)
+        return obs[:, :2] + self.offset, None
+
+
+def make_observations(agents, batch_shape=()):
+    """Distinct observation per agent, tagged with the agent index."""
+    return {
+        agent: np.full(batch_shape + (5,), float(i), dtype=np.float32)
+        for i, agent in enumerate(agents)
+    }
+
+
+AGENTS = ["firm_0", "firm_1", "firm_2"]
+
+
+class TestPredictActions:
+    """Test batched policy queries."""
+
+    def test_shared_model(self):
+        """Agents sharing a model are predicted in one call, in agent order."""
+        model = StubModel()
+        models = dict.fromkeys(AGENTS, model)
+
+        actions = predict_actions(models, make_observations(AGENTS))
+
+        assert model.batch_shapes == [(3, 5)]
+        for i, agent in enumerate(AGENTS):
+            np.testing.assert_array_equal(actions[agent], [i, i])
+
+    def test_separate_models(self):
+        """Each distinct model gets its own call with only its agents."""
+        shared, own = StubModel(), StubModel(offset=100.0)
+        models = {"firm_0": shared, "firm_1": own, "firm_2": shared}
+
+        actions = predict_actions(models, make_observations(AGENTS))
+
+        assert shared.batch_shapes == [(2, 5)]
+        assert own.batch_shapes == [(1, 5)]
+        np.testing.assert_array_equal(actions["firm_0"], [0, 0])
+        np.testing.assert_array_equal(actions["firm_1"], [101, 101])
+        np.testing.assert_array_equal(actions["firm_2"], [2, 2])
+        assert set(actions) == set(AGENTS)
+
+    def test_batched_observations(self):
+        """Leading batch axes are flattened into the call and restored per agent."""
+        model = StubModel()
+        models = dict.fromkeys(AGENTS, model)
+
+        actions = predict_actions(models, make_observations(AGENTS, batch_shape=(4,)))
+
+        assert model.batch_shapes == [(12, 5)]
+        for i, agent in enumerate(AGENTS):
+            assert actions[agent].shape == (4, 2)
+            np.testing.assert_array_equal(actions[agent], np.full((4, 2), i))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,204 @@
+"""
+Unit Tests for the core economic models
+
+Validates:
+- Demand kernels (compiled, scalar and NumPy) agree
+- Batched and stateful demand match compute_demand
+- Innovation effect input handling
+- Reproducible market shocks
+- HHI and price-dispersion kernels match pandas groupby
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from core.models._kernels import (
+    demand_kernel,
+    demand_kernel_numpy,
+    demand_kernel_small,
+    group_std_kernel,
+    group_std_kernel_numpy,
+    hhi_kernel,
+    hhi_kernel_numpy,
+)
+from core.models.concentration import herfindahl_index
+from core.models.dispersion import price_dispersion
+from core.models import market_shocks
+from core.models.demand import DemandModel, compute_demand, compute_demand_batch
+from core.models.innovation import innovation_effect
+
+
+class TestDemandKernels:
+    """Test that all demand kernel implementations agree."""
+
+    @pytest.mark.parametrize("innovation", [
+        [0.0, 0.0, 0.0],
+        [5.0, 0.0, 12.0],
+    ])
+    def test_kernels_match(self, innovation):
+        """Compiled, scalar and NumPy kernels give the same shares and demand."""
+        prices = np.array([120.0, 150.0, 90.0])
+        innovation = np.array(innovation)
+
+        results = []
+        for kernel in (demand_kernel, demand_kernel_small, demand_kernel_numpy):
+            out_demand, out_share = np.empty(3), np.empty(3)
+            kernel(prices, innovation, 1000.0, 0.02, 0.3, out_demand, out_share)
+            results.append((out_demand, out_share))
+
+        for out_demand, out_share in results[1:]:
+            np.testing.assert_allclose(out_share, results[0][1], rtol=1e-12)
+            np.testing.assert_allclose(out_demand, results[0][0], rtol=1e-12)
+        assert np.isclose(results[0][1].sum(), 1.0)
+
+
+@pytest.fixture
+def market_rows():
+    """Prices and innovation for several 3-firm markets, one without innovation."""
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(80, 250, (6, 3))
+    innovation = rng.uniform(0, 50, (6, 3))
+    innovation[0] = 0.0
+    innovation[3] = [0.0, 7.0, 0.0]
+    return prices, innovation
+
+
+class TestDemandVariants:
+    """Test batched and stateful demand against compute_demand."""
+
+    def test_batch_matches_rows(self, market_rows):
+        """compute_demand_batch equals compute_demand applied row by row."""
+        prices, innovation = market_rows
+        base_demand = np.linspace(800, 1200, len(prices))
+
+        batch_demand, batch_share = compute_demand_batch(prices, innovation, base_demand=base_demand)
+
+        for row, (p, i, d) in enumerate(zip(prices, innovation, base_demand)):
+            demand, share = compute_demand(p, i, base_demand=d)
+            np.testing.assert_allclose(batch_share[row], share, rtol=1e-12)
+            np.testing.assert_allclose(batch_demand[row], demand, rtol=1e-12)
+
+    def test_batch_leading_axes(self, market_rows):
+        """Extra leading batch axes and scalar base demand are supported."""
+        prices, innovation = market_rows
+
+        flat_demand, _ = compute_demand_batch(prices, innovation)
+        demand, share = compute_demand_batch(prices.reshape(2, 3, 3), innovation.reshape(2, 3, 3))
+
+        assert demand.shape == (2, 3, 3)
+        np.testing.assert_allclose(demand.reshape(6, 3), flat_demand)
+        np.testing.assert_allclose(share.sum(axis=-1), 1.0)
+
+    def test_demand_model_matches_rows(self, market_rows):
+        """DemandModel equals compute_demand step by step."""
+        prices, innovation = market_rows
+        model = DemandModel(n_firms=3)
+
+        for p, i in zip(prices, innovation):
+            model.update_innovation(i)
+            model_demand, model_share = model.compute(p)
+            demand, share = compute_demand(p, i)
+
+            np.testing.assert_allclose(model_share, share, rtol=1e-12)
+            np.testing.assert_allclose(model_demand, demand, rtol=1e-12)
+
+
+class TestInnovationEffect:
+    """Test innovation effect inputs (baseline NumPy implementation)."""
+
+    def test_accepts_list_and_series(self):
+        """Lists and Series work like arrays."""
+        expected = 0.3 * np.log1p([1.0, 2.0])
+
+        np.testing.assert_allclose(innovation_effect([1.0, 2.0]), expected)
+        np.testing.assert_allclose(innovation_effect(pd.Series([1.0, 2.0])), expected)
+        assert np.isclose(innovation_effect(1.0), expected[0])
+
+    def test_linear(self):
+        """Linear mode scales the innovation stock."""
+        np.testing.assert_allclose(
+            innovation_effect(np.array([1.0, 2.0]), diminishing_returns=False),
+            [0.3, 0.6],
+        )
+
+
+class TestMarketShocks:
+    """Test shock reproducibility."""
+
+    @pytest.mark.parametrize("shock", [market_shocks.demand_shock, market_shocks.cost_shock])
+    def test_rng_argument(self, shock):
+        """Same-seeded generators give the same shocks."""
+        first = shock(100.0, size=5, rng=np.random.default_rng(1))
+        second = shock(100.0, size=5, rng=np.random.default_rng(1))
+
+        np.testing.assert_array_equal(first, second)
+
+    def test_module_seed(self):
+        """Reseeding the module generator replays the same shocks."""
+        market_shocks.seed(3)
+        first = [market_shocks.demand_shock(100.0), market_shocks.cost_shock(80.0)]
+        market_shocks.seed(3)
+        second = [market_shocks.demand_shock(100.0), market_shocks.cost_shock(80.0)]
+
+        assert first == second
+
+
+
+@pytest.fixture
+def share_panel():
+    """Firm-observation rows in shuffled groups, including a single-row group."""
+    rng = np.random.default_rng(0)
+    group_ids = np.concatenate([np.repeat([0, 1, 2, 3], 3), [4]])
+    rng.shuffle(group_ids)
+    return pd.DataFrame({
+        "group": group_ids,
+        "share": rng.uniform(0, 1, len(group_ids)),
+        "price": rng.uniform(80, 250, len(group_ids)),
+    })
+
+
+class TestConcentration:
+    """Test HHI kernels against pandas."""
+
+    @pytest.mark.parametrize("kernel", [hhi_kernel, hhi_kernel_numpy])
+    def test_kernel_matches_groupby(self, share_panel, kernel):
+        """Compiled and NumPy kernels equal the groupby sum of squared shares."""
+        expected = (share_panel["share"] ** 2).groupby(share_panel["group"]).sum()
+
+        hhi = kernel(share_panel["group"].to_numpy(), share_panel["share"].to_numpy(), 5)
+
+        np.testing.assert_allclose(hhi, expected.to_numpy(), rtol=1e-12)
+
+    def test_herfindahl_index(self, share_panel):
+        """Public wrapper accepts lists and leaves empty groups at zero."""
+        hhi = herfindahl_index(share_panel["share"].tolist(), share_panel["group"].tolist(), 6)
+
+        assert hhi.shape == (6,)
+        assert hhi[5] == 0.0
+
+
+
+class TestDispersion:
+    """Test per-group price std kernels against pandas."""
+
+    @pytest.mark.parametrize("kernel", [group_std_kernel, group_std_kernel_numpy])
+    def test_kernel_matches_groupby(self, share_panel, kernel):
+        """Compiled and NumPy kernels equal groupby std (ddof=1), NaN for single rows."""
+        expected = share_panel.groupby("group")["price"].std()
+
+        std = kernel(share_panel["group"].to_numpy(), share_panel["price"].to_numpy(), 5)
+
+        assert np.isnan(std[4]) and np.isnan(expected[4])
+        np.testing.assert_allclose(std, expected.to_numpy(), rtol=1e-12)
+
+    def test_price_dispersion(self, share_panel):
+        """Public wrapper leaves empty groups at NaN."""
+        std = price_dispersion(share_panel["price"].tolist(), share_panel["group"].tolist(), 6)
+
+        assert std.shape == (6,)
+        assert np.isnan(std[5])
+        assert np.all(np.isfinite(std[:4]))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+"""
+Unit Tests for the core utilities
+
+Validates:
+- Parquet sidecar cache of read_csv_cached (hit, stale, old schema)
+- Plain CSV path without pyarrow
+"""
+
+import os
+
+import pytest
+import numpy as np
+import pandas as pd
+from core.utils import helpers
+from core.utils.helpers import read_csv_cached
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """Small tournament-like CSV."""
+    path = tmp_path / "results.csv"
+    pd.DataFrame({
+        "step": [0, 0, 1, 1],
+        "agent": ["firm_0", "firm_1", "firm_0", "firm_1"],
+        "price": [100.0, 120.0, 110.0, 130.0],
+    }).to_csv(path, index=False)
+    return path
+
+
+def set_mtime(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+
+class TestReadCsvCached:
+    """Test the Parquet sidecar cache."""
+
+    @pytest.fixture(autouse=True)
+    def require_pyarrow(self):
+        pytest.importorskip("pyarrow")
+
+    def test_first_read_writes_sidecar(self, csv_path):
+        """First read parses the CSV and caches it."""
+        df = read_csv_cached(csv_path, columns=["step", "price"], dtype={"step": "int32"})
+
+        assert list(df.columns) == ["step", "price"]
+        assert df["step"].dtype == np.int32
+
+        # The sidecar keeps every column, at the parse dtypes
+        cached = pd.read_parquet(csv_path.with_suffix(".parquet"))
+        assert list(cached.columns) == ["step", "agent", "price"]
+        assert cached["step"].dtype == np.int32
+
+    def test_cache_hit(self, csv_path):
+        """A sidecar newer than the CSV is read instead of the CSV."""
+        read_csv_cached(csv_path)
+        pd.DataFrame({"step": [9], "agent": ["firm_9"], "price": [1.0]}).to_parquet(
+            csv_path.with_suffix(".parquet"), index=False
+        )
+        set_mtime(csv_path, 1_000_000)
+
+        df = read_csv_cached(csv_path, dtype={"agent": "category"})
+
+        assert df["step"].tolist() == [9]
+        assert df["agent"].dtype == "category"
+
+    def test_stale_cache(self, csv_path):
+        """A CSV newer than its sidecar is re-parsed and re-cached."""
+        read_csv_cached(csv_path)
+        parquet_path = csv_path.with_suffix(".parquet")
+        set_mtime(parquet_path, 1_000_000)
+        pd.DataFrame({"step": [5], "agent": ["firm_5"], "price": [50.0]}).to_csv(csv_path, index=False)
+
+        df = read_csv_cached(csv_path)
+
+        assert df["step"].tolist() == [5]
+        assert pd.read_parquet(parquet_path)["step"].tolist() == [5]
+
+    def test_old_schema_cache(self, csv_path):
+        """A sidecar missing requested columns falls back to the CSV and is rewritten."""
+        parquet_path = csv_path.with_suffix(".parquet")
+        pd.DataFrame({"step": [0]}).to_parquet(parquet_path, index=False)
+        set_mtime(csv_path, 1_000_000)
+
+        df = read_csv_cached(csv_path, columns=["step", "price"], dtype={"price": "float32"})
+
+        assert df["price"].tolist() == [100.0, 120.0, 110.0, 130.0]
+        assert list(pd.read_parquet(parquet_path).columns) == ["step", "agent", "price"]
+
+    def test_corrupt_cache(self, csv_path):
+        """An unreadable sidecar falls back to the CSV."""
+        csv_path.with_suffix(".parquet").write_bytes(b"not parquet")
+        set_mtime(csv_path, 1_000_000)
+
+        df = read_csv_cached(csv_path)
+
+        assert len(df) == 4
+
+
+class TestReadCsvWithoutPyarrow:
+    """Test the plain CSV path."""
+
+    def test_reads_csv_without_sidecar(self, csv_path, monkeypatch):
+        """Without pyarrow the CSV is parsed and nothing is cached."""
+        monkeypatch.setattr(helpers, "_HAS_PYARROW", False)
+
+        df = read_csv_cached(csv_path, columns=["agent", "price"], dtype={"agent": "category", "missing": "int32"})
+
+        assert list(df.columns) == ["agent", "price"]
+        assert df["agent"].dtype == "category"
+        assert not csv_path.with_suffix(".parquet").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+"""
+Unit Tests for the tournament evaluation pipeline
+
+Validates:
+- Model discovery and loading from saved files
+- Parallel episodes (n_jobs > 1) with per-worker model loading
+"""
+
+import pytest
+import numpy as np
+
+pytest.importorskip("stable_baselines3")
+
+from gymnasium import Env, spaces
+from stable_baselines3 import PPO
+from version1.agents.eval_tournament import (
+    find_model_paths,
+    load_model_files,
+    run_tournament,
+)
+from version1.env.market_env_multi_v1 import MarketEnvMultiV1
+
+
+class _SpacesEnv(Env):
+    """Placeholder env carrying MarketEnvMultiV1's per-agent spaces."""
+
+    def __init__(self):
+        super().__init__()
+        market = MarketEnvMultiV1(n_firms=3)
+        obs, _ = market.reset(seed=0)
+        self.observation_space = spaces.Box(
+            low=0.0, high=1e6, shape=obs["firm_0"].shape, dtype=np.float32
+        )
+        self.action_space = market.action_space("firm_0")
+
+    def reset(self, seed=None, options=None):
+        return np.zeros(self.observation_space.shape, dtype=np.float32), {}
+
+    def step(self, action):
+        return np.zeros(self.observation_space.shape, dtype=np.float32), 0.0, False, False, {}
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """Directory with one untrained saved PPO model per firm."""
+    env = _SpacesEnv()
+    for agent in ["firm_0", "firm_1", "firm_2"]:
+        PPO("MlpPolicy", env, n_steps=64, batch_size=32, seed=0).save(tmp_path / f"{agent}_0.zip")
+    return tmp_path
+
+
+class TestTournament:
+    """Test tournament runs."""
+
+    def test_find_and_load_models(self, model_dir):
+        """Each firm gets its latest saved model."""
+        model_paths = find_model_paths(str(model_dir))
+        models = load_model_files(model_paths)
+
+        assert list(model_paths) == ["firm_0", "firm_1", "firm_2"]
+        assert all(isinstance(model, PPO) for model in models.values())
+
+    def test_parallel_requires_model_paths(self, model_dir, tmp_path):
+        """Workers load from files, so n_jobs > 1 needs model paths."""
+        models = load_model_files(find_model_paths(str(model_dir)))
+
+        with pytest.raises(ValueError):
+            run_tournament(models, n_episodes=2, max_steps=5, output_dir=str(tmp_path / "logs"), n_jobs=2)
+
+    def test_parallel_tournament(self, model_dir, tmp_path):
+        """Episodes run in worker processes and are logged like sequential ones."""
+        model_paths = find_model_paths(str(model_dir))
+        models = load_model_files(model_paths)
+
+        logs = run_tournament(
+            models,
+            n_episodes=3,
+            max_steps=5,
+            output_dir=str(tmp_path / "logs"),
+            n_jobs=2,
+            model_paths=model_paths,
+        )
+
+        assert len(logs) == 3 * 5 * 3
+        assert sorted(logs["episode"].unique()) == [0, 1, 2]
+        assert np.all(np.isfinite(logs["cum_profit"]))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -13,7 +13,14 @@ Validates:
 
 import pytest
 import numpy as np
-from version1.env.market_env_multi_v1 import MarketEnvMultiV1
+from version1.env.market_env_multi_v1 import (
+    BatchedMarketEnv,
+    MarketEnvMultiV1,
+    clip_actions_kernel,
+    clip_actions_kernel_numpy,
+    market_step_kernel,
+    market_step_kernel_numpy,
+)
 
 
 class TestEnvironmentBasics:
@@ -78,6 +85,112 @@ class TestEnvironmentBasics:
         for agent in env.agents:
             assert isinstance(term[agent], (bool, np.bool_))
 
+    def test_step_returns_fresh_dicts(self):
+        """Mutating returned dicts does not leak into later steps."""
+        env = MarketEnvMultiV1(n_firms=3, max_steps=200, seed=0)
+        env.reset()
+        actions = {agent: np.array([150.0, 10.0]) for agent in env.agents}
+
+        _, _, term, trunc, info = env.step(actions)
+        term.pop("firm_0")
+        trunc["firm_1"] = True
+        info["firm_2"]["x"] = 1
+
+        _, _, term, trunc, info = env.step(actions)
+        assert term == dict.fromkeys(env.agents, False)
+        assert trunc == dict.fromkeys(env.agents, False)
+        assert info == {agent: {} for agent in env.agents}
+
+    def test_sample_actions(self):
+        """Batched random actions have the right shape and respect bounds."""
+        env = MarketEnvMultiV1(n_firms=3, max_steps=200)
+        actions = env.sample_actions(50, rng=np.random.default_rng(0))
+
+        assert actions.shape == (50, 3, 2)
+        for i, agent in enumerate(env.agents):
+            space = env.action_space(agent)
+            assert np.all(actions[:, i] >= space.low)
+            assert np.all(actions[:, i] <= space.high)
+
+    def test_step_array_matches_step(self):
+        """Array step produces the same rewards as dict step."""
+        env1 = MarketEnvMultiV1(n_firms=3, max_steps=200, seed=7)
+        env2 = MarketEnvMultiV1(n_firms=3, max_steps=200, seed=7)
+        env1.reset()
+        env2.reset()
+
+        for action_arr in env1.sample_actions(20, rng=np.random.default_rng(0)):
+            _, rewards, term, _, _ = env1.step(dict(zip(env1.agents, action_arr)))
+            reward_arr, done, _, _ = env2.step_array(action_arr)
+
+            np.testing.assert_array_equal(reward_arr, [rewards[a] for a in env1.agents])
+            assert done == any(term.values())
+
+    @pytest.mark.parametrize("shock_block", [20, 7])
+    def test_batched_env_matches_sequential(self, shock_block):
+        """Batched markets reproduce the single-market episodes exactly with the same seeds."""
+        seeds = [3, 4, 5]
+        envs = [MarketEnvMultiV1(n_firms=3, max_steps=20, seed=seed) for seed in seeds]
+        batched = BatchedMarketEnv(n_firms=3, max_steps=20)
+
+        # Shock blocks shorter than the episode are redrawn mid-episode
+        for env in envs + [batched.market]:
+            env._shock_block = shock_block
+
+        obs = batched.reset(seeds)
+        for b, env in enumerate(envs):
+            np.testing.assert_array_equal(obs[b], env.reset()[0]["firm_0"])
+
+        actions = envs[0].sample_actions(20 * len(seeds), rng=np.random.default_rng(0))
+        for step_actions in actions.reshape(20, len(seeds), 3, 2):
+            obs, rewards, done = batched.step(step_actions)
+
+            for b, env in enumerate(envs):
+                env_obs, env_rewards, term, _, _ = env.step(dict(zip(env.agents, step_actions[b])))
+                np.testing.assert_array_equal(obs[b], env_obs["firm_0"])
+                np.testing.assert_array_equal(rewards[b], [env_rewards[a] for a in env.agents])
+                assert done == any(term.values())
+
+        assert done
+
+
+class TestKernels:
+    """Test the NumPy fallbacks against the compiled kernels."""
+
+    def test_numpy_kernels_match(self):
+        """Vectorized kernels give the same state and profits as the loops."""
+        env = MarketEnvMultiV1(n_firms=3)
+        rng = np.random.default_rng(0)
+        n_envs = 5
+
+        # Out-of-bounds prices and negative R&D exercise the clipping
+        actions = np.stack([
+            rng.uniform(0.0, 400.0, (n_envs, 3)),
+            rng.uniform(-10.0, 50.0, (n_envs, 3)),
+        ], axis=-1).astype(np.float32)
+        marginal_costs = rng.uniform(70.0, 90.0, (n_envs, 3)).astype(np.float32)
+        innovation = rng.uniform(0.0, 40.0, (n_envs, 3)).astype(np.float32)
+        innovation[0] = 0.0
+        shocks = [rng.uniform(0.7, 1.3, n_envs) for _ in range(2)] + [rng.uniform(0.05, 0.3, n_envs)]
+
+        results = []
+        for clip, market_step in [
+            (clip_actions_kernel, market_step_kernel),
+            (clip_actions_kernel_numpy, market_step_kernel_numpy),
+        ]:
+            prices = np.empty((n_envs, 3), dtype=np.float32)
+            rd = np.empty((n_envs, 3), dtype=np.float32)
+            clip(actions, marginal_costs, env.P_min_margin, env.P_max, prices, rd)
+
+            state = [marginal_costs.copy(), np.empty((n_envs, 3), dtype=np.float32),
+                     np.empty(n_envs), np.empty(n_envs)]
+            profits = market_step(prices, innovation, rd, *shocks, 7, env._kernel_params, *state)
+            results.append([prices, rd, profits] + state)
+
+        for compiled, vectorized in zip(*results):
+            assert compiled.dtype == vectorized.dtype
+            np.testing.assert_allclose(vectorized, compiled, rtol=1e-6)
+
 
 class TestEconomics:
     """Test economic model consistency."""
@@ -158,12 +271,14 @@ class TestEconomics:
         env = MarketEnvMultiV1(n_firms=3, max_steps=200, seed=42)
         obs, _ = env.reset()
         
-        for _ in range(50):
-            actions = {
-                "firm_0": np.array([np.random.uniform(100, 250), np.random.uniform(0, 20)]),
-                "firm_1": np.array([np.random.uniform(100, 250), np.random.uniform(0, 20)]),
-                "firm_2": np.array([np.random.uniform(100, 250), np.random.uniform(0, 20)]),
-            }
+        # Random [price, R&D] actions for all 50 steps, drawn in one batch
+        all_actions = np.stack([
+            np.random.uniform(100, 250, (50, 3)),
+            np.random.uniform(0, 20, (50, 3)),
+        ], axis=-1)
+        
+        for step_actions in all_actions:
+            actions = dict(zip(env.agents, step_actions))
             obs, rewards, term, trunc, info = env.step(actions)
             
             share_sum = np.sum(env.market_shares)
@@ -240,6 +355,17 @@ class TestEpisodeTermination:
             else:
                 assert any(term.values()), f"Episode didn't terminate at max_steps"
 
+    def test_rollout_stops_at_max_steps(self):
+        """Rollout over a longer action sequence stops at max_steps."""
+        env = MarketEnvMultiV1(n_firms=3, max_steps=50, seed=42)
+        env.reset()
+
+        rewards = env.rollout(env.sample_actions(80, rng=np.random.default_rng(0)))
+
+        assert rewards.shape == (50, 3)
+        assert np.all(np.isfinite(rewards))
+        assert env.timestep == 50
+
 
 class TestObservationFormat:
     """Test observation vector format and content."""